@@ -0,0 +1,96 @@
+"""add question content hash
+
+Revision ID: 3b7e91c4d2a8
+Revises: fcc00cb22509
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+import hashlib
+import json
+from typing import Iterable, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e91c4d2a8'
+down_revision: Union[str, None] = 'fcc00cb22509'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def compute_content_hash(
+    question: str, level: int, answers: Iterable[Tuple[str, bool]]
+) -> str:
+    # Frozen copy of app.models.compute_content_hash as of this revision, so
+    # later changes to the app's hash do not change what this migration writes
+    canonical = json.dumps(
+        [question, level, sorted([answer, bool(correct)] for answer, correct in answers)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('questions', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Backfill hashes for existing questions in batches
+    bind = op.get_bind()
+    questions = sa.table(
+        'questions',
+        sa.column('id', sa.Integer),
+        sa.column('question', sa.Text),
+        sa.column('level', sa.Integer),
+        sa.column('content_hash', sa.String),
+    )
+    answers = sa.table(
+        'answers',
+        sa.column('question_id', sa.Integer),
+        sa.column('answer', sa.Text),
+        sa.column('correct', sa.Boolean),
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(questions.c.id, questions.c.question, questions.c.level)
+            .where(questions.c.id > last_id)
+            .order_by(questions.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        answers_by_question = {row.id: [] for row in rows}
+        for question_id, answer, correct in bind.execute(
+            sa.select(answers.c.question_id, answers.c.answer, answers.c.correct).where(
+                answers.c.question_id.in_(list(answers_by_question))
+            )
+        ):
+            answers_by_question[question_id].append((answer, correct))
+
+        bind.execute(
+            questions.update()
+            .where(questions.c.id == sa.bindparam('b_id'))
+            .values(content_hash=sa.bindparam('b_hash')),
+            [
+                {
+                    'b_id': row.id,
+                    'b_hash': compute_content_hash(
+                        row.question, row.level, answers_by_question[row.id]
+                    ),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('questions', 'content_hash')
@@ -0,0 +1,57 @@
+"""add lookup indexes
+
+Revision ID: 5d2e8a7f3c61
+Revises: 9c4f0a6e1b27
+Create Date: 2026-10-17 14:26:51.904318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a7f3c61'
+down_revision: Union[str, None] = '9c4f0a6e1b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A failed CREATE UNIQUE INDEX CONCURRENTLY leaves an invalid index behind,
+    # so refuse up front if the unique index cannot be built.
+    if not op.get_context().as_sql:
+        duplicate = op.get_bind().execute(
+            sa.text(
+                'SELECT question FROM questions GROUP BY question HAVING count(*) > 1 LIMIT 1'
+            )
+        ).first()
+        if duplicate is not None:
+            raise RuntimeError(
+                f'Duplicate question text must be removed before upgrading: {duplicate.question!r}'
+            )
+
+    # CONCURRENTLY cannot run inside a transaction, and does not lock out writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_answers_question_id', 'answers', ['question_id'], unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_questions_level', 'questions', ['level'], unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'uq_questions_question_md5', 'questions', [sa.text('md5(question)')], unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_questions_question_md5', table_name='questions', postgresql_concurrently=True)
+        op.drop_index('ix_questions_level', table_name='questions', postgresql_concurrently=True)
+        op.drop_index('ix_answers_question_id', table_name='answers', postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""add ratings
+
+Revision ID: 8e4b2d6a1f93
+Revises: 7a1c3e5b9d02
+Create Date: 2026-10-17 17:48:12.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b2d6a1f93'
+down_revision: Union[str, None] = '7a1c3e5b9d02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('questions', sa.Column('rating', sa.Float(), server_default='1500', nullable=False))
+    op.add_column('questions', sa.Column('rating_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('rating', sa.Float(), server_default='1500', nullable=False))
+    op.add_column('users', sa.Column('rating_attempts', sa.Integer(), server_default='0', nullable=False))
+
+    # Start existing questions from their level, as seeds/seed.py does for new ones
+    op.execute('UPDATE questions SET rating = 1500 + (level - 11) * 150')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_rating', 'questions', ['rating'], unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_questions_rating', table_name='questions', postgresql_concurrently=True)
+    op.drop_column('users', 'rating_attempts')
+    op.drop_column('users', 'rating')
+    op.drop_column('questions', 'rating_attempts')
+    op.drop_column('questions', 'rating')
@@ -0,0 +1,35 @@
+"""add spent quizzes
+
+Revision ID: d4a8c2f6e1b5
+Revises: b3d7f1e9a254
+Create Date: 2026-10-17 21:08:12.540317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8c2f6e1b5'
+down_revision: Union[str, None] = 'b3d7f1e9a254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('spent_quizzes',
+    sa.Column('token_hash', sa.LargeBinary(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_spent_quizzes_expires_at'), 'spent_quizzes', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_spent_quizzes_expires_at'), table_name='spent_quizzes')
+    op.drop_table('spent_quizzes')
@@ -0,0 +1,31 @@
+"""add seed run skip_existing
+
+Revision ID: e7b3f9a2c4d6
+Revises: d4a8c2f6e1b5
+Create Date: 2026-10-17 22:41:19.207563
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3f9a2c4d6'
+down_revision: Union[str, None] = 'd4a8c2f6e1b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('seed_runs', sa.Column('skip_existing', sa.Boolean(), server_default='false', nullable=False))
+    # The mode of earlier runs was not recorded; assume they skipped existing
+    # questions, so the next --updates run checks those files again
+    op.execute("UPDATE seed_runs SET skip_existing = true")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('seed_runs', 'skip_existing')
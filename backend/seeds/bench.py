@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the src directory to the path to allow importing app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+from app.models import Base
+from generate import generate_items, write_seed_file
+from sqlalchemy.ext.asyncio import create_async_engine
+
+DEFAULT_SIZES = "1000,100000"
+
+
+def run_scenario(database_url: str, seed_dirs: dict, argv: list[str]) -> dict:
+    """
+    Run one seed.py invocation and measure it. Called in a fresh process.
+
+    Args:
+        database_url: Database to seed
+        seed_dirs: Replacement initial/updates/tests seed directories
+        argv: seed.py command line arguments
+
+    Returns:
+        dict: Wall time, statements sent to the database and peak RSS
+    """
+    os.environ["DATABASE_URL"] = database_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        import seed
+        from sqlalchemy import event
+
+    seed.engine.sync_engine.echo = False
+    seed.INITIAL_SEEDS = seed_dirs["initial"]
+    seed.UPDATE_SEEDS = seed_dirs["updates"]
+    seed.TEST_SEEDS = seed_dirs["tests"]
+
+    statements = 0
+
+    def count_statement(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(seed.engine.sync_engine, "before_cursor_execute", count_statement)
+
+    args = seed.build_arg_parser().parse_args(argv)
+    # The seeding report lists every change; keep it out of the timing output
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        ok = asyncio.run(seed.run_and_dispose(seed.run_seeding(args)))
+        elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux
+    return {
+        "ok": ok,
+        "seconds": elapsed,
+        "statements": statements,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_worker_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        / 1024,
+    }
+
+
+async def reset_schema(database_url: str) -> None:
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+    finally:
+        await engine.dispose()
+
+
+def bench_size(
+    size: int, workdir: str, database_url: str, args: argparse.Namespace
+) -> list[dict]:
+    """
+    Generate a bank of ``size`` questions and time each seeding path against it.
+
+    Scenarios run in order on one database: ``--all`` into empty tables,
+    ``--all`` again (skipped by the manifest), ``--all --force`` (every
+    question compared, none changed) and ``--update-file`` with the changed
+    and duplicate fractions.
+    """
+    seed_dirs = {
+        name: os.path.join(workdir, str(size), name)
+        for name in ("initial", "updates", "tests")
+    }
+    for directory in seed_dirs.values():
+        os.makedirs(directory, exist_ok=True)
+
+    suffix = ".ndjson" if args.ndjson else ".json"
+    bank_file = os.path.join(seed_dirs["initial"], f"bank{suffix}")
+    update_file = os.path.join(workdir, str(size), f"update{suffix}")
+    bank_items = write_seed_file(bank_file, generate_items(size, args.seed))
+    update_items = write_seed_file(
+        update_file,
+        generate_items(size, args.seed, 0, args.changed, args.duplicates),
+    )
+
+    extra = ["--stream"] if args.stream else []
+    if args.workers:
+        extra += ["--workers", str(args.workers)]
+    scenarios = [
+        ("all", ["--all"], bank_items),
+        ("all (unchanged)", ["--all"], bank_items),
+        ("all --force", ["--all", "--force"], bank_items),
+        ("update-file", ["--update-file", update_file], update_items),
+    ]
+
+    asyncio.run(reset_schema(database_url))
+    results = []
+    # A fresh process per scenario, so peak RSS is not carried over between them
+    context = multiprocessing.get_context("spawn")
+    for name, argv, items in scenarios:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(
+                run_scenario, database_url, seed_dirs, argv + extra
+            ).result()
+        result.update(
+            size=size,
+            scenario=name,
+            items=items,
+            rows_per_second=items / result["seconds"] if result["seconds"] else None,
+        )
+        results.append(result)
+        print(
+            f"  {size:>9} {name:<16} {result['seconds']:>9.2f}s "
+            f"{result['rows_per_second']:>12,.0f} rows/s "
+            f"{result['statements']:>8} statements "
+            f"{result['peak_rss_mb']:>8.1f} MB"
+            + ("" if result["ok"] else "  (validation failed)")
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure seed.py throughput on generated question banks"
+    )
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma separated bank sizes (default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Scratch database to benchmark against; ALL ITS TABLES ARE DROPPED. "
+        "Defaults to a temporary SQLite file",
+    )
+    parser.add_argument(
+        "--changed",
+        type=float,
+        default=0.1,
+        help="Fraction of questions changed in the update file (default: 0.1)",
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=float,
+        default=0.01,
+        help="Fraction of repeated questions in the update file (default: 0.01)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument(
+        "--ndjson", action="store_true", help="Generate NDJSON instead of JSON arrays"
+    )
+    parser.add_argument(
+        "--stream", action="store_true", help="Benchmark seed.py --stream"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Passed to seed.py --workers"
+    )
+    parser.add_argument("--json", default=None, help="Also write results to this file")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="seed-bench-") as workdir:
+        # Never fall back to DATABASE_URL: the benchmark drops every table
+        database_url = (
+            args.database_url
+            or f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+        )
+        print(f"Benchmarking seed.py against {database_url}")
+        results = []
+        for size in (int(s) for s in args.sizes.split(",")):
+            results.extend(bench_size(size, workdir, database_url, args))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Wrote results to {args.json}")
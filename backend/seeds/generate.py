@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+import argparse
+import json
+import os
+import random
+
+LEVELS = (10, 11, 12)
+ANSWERS_PER_QUESTION = 4
+
+
+def synthetic_question(index: int, seed: int, changed: bool = False) -> dict:
+    """
+    Build the synthetic question number ``index``.
+
+    The same ``index`` and ``seed`` always give the same question text, so
+    files generated with the same seed describe the same questions. A changed
+    question keeps its text but moves to another level and gets a different
+    set of wrong answers, which the seeder detects as an update.
+
+    Args:
+        index: Question number within the synthetic bank
+        seed: Seed shared by files describing the same bank
+        changed: Whether to return the changed variant of the question
+
+    Returns:
+        dict: Question in the seed file schema
+    """
+    rng = random.Random(f"{seed}:{index}")
+    a, b = rng.randint(2, 999), rng.randint(2, 999)
+    level = rng.choice(LEVELS)
+    correct = a + b
+
+    wrong = set()
+    offset = 100 if changed else 1
+    while len(wrong) < ANSWERS_PER_QUESTION - 1:
+        wrong.add(correct + rng.choice((-1, 1)) * rng.randint(offset, offset + 50))
+    if changed:
+        level = LEVELS[(LEVELS.index(level) + 1) % len(LEVELS)]
+
+    answers = [{"answer": str(correct), "correct": True}] + [
+        {"answer": str(value), "correct": False} for value in sorted(wrong)
+    ]
+    rng.shuffle(answers)
+    return {
+        "question": f"[synthetic {seed}-{index}] What is {a} + {b}?",
+        "level": level,
+        "answers": answers,
+    }
+
+
+def is_changed(index: int, seed: int, changed_fraction: float) -> bool:
+    return random.Random(f"{seed}:{index}:changed").random() < changed_fraction
+
+
+def generate_items(
+    count: int,
+    seed: int = 0,
+    start: int = 0,
+    changed_fraction: float = 0.0,
+    duplicate_fraction: float = 0.0,
+):
+    """
+    Yield ``count`` synthetic questions, plus duplicates.
+
+    Args:
+        count: Number of distinct questions
+        seed: Seed shared by files describing the same bank
+        start: Index of the first question, to generate new questions beyond an existing bank
+        changed_fraction: Fraction of questions that differ from the unchanged bank
+        duplicate_fraction: Extra copies of already generated questions, as a fraction of ``count``
+
+    Yields:
+        dict: Questions in the seed file schema
+    """
+    rng = random.Random(seed)
+    for index in range(start, start + count):
+        yield synthetic_question(index, seed, is_changed(index, seed, changed_fraction))
+        if index > start and rng.random() < duplicate_fraction:
+            # An exact repeat, so duplicates never undo a changed question
+            copy = rng.randrange(start, index)
+            yield synthetic_question(copy, seed, is_changed(copy, seed, changed_fraction))
+
+
+def write_seed_file(path: str, items) -> int:
+    """
+    Write questions as a JSON array, or as NDJSON if ``path`` has an NDJSON suffix.
+
+    Items are written one at a time, so large files never sit in memory.
+
+    Returns:
+        int: Number of items written
+    """
+    ndjson = path.endswith((".ndjson", ".jsonl"))
+    written = 0
+    with open(path, "w") as f:
+        if not ndjson:
+            f.write("[\n")
+        for item in items:
+            if not ndjson and written:
+                f.write(",\n")
+            f.write(json.dumps(item))
+            if ndjson:
+                f.write("\n")
+            written += 1
+        if not ndjson:
+            f.write("\n]\n")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic seed file for load testing the seeder"
+    )
+    parser.add_argument("output", help="File to write (.json, or .ndjson/.jsonl)")
+    parser.add_argument(
+        "--count", type=int, default=1000, help="Number of distinct questions (default: 1000)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Files generated with the same seed describe the same questions (default: 0)",
+    )
+    parser.add_argument(
+        "--start", type=int, default=0, help="Index of the first question (default: 0)"
+    )
+    parser.add_argument(
+        "--changed",
+        type=float,
+        default=0.0,
+        help="Fraction of questions that differ from the same seed's unchanged file",
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=float,
+        default=0.0,
+        help="Fraction of extra repeated questions within the file",
+    )
+
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    written = write_seed_file(
+        args.output,
+        generate_items(
+            args.count, args.seed, args.start, args.changed, args.duplicates
+        ),
+    )
+    print(f"✅ Wrote {written} questions to {args.output}")
@@ -2,17 +2,32 @@
 import argparse
 import asyncio
 import glob
+import hashlib
 import json
 import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 
 # Add the src directory to the path to allow importing app modules
 sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
 
-from app.models import Answer, Question, User
+from app.db.slow_queries import slow_query_log
+from app.models import (
+    BANK_VERSION_ID,
+    Answer,
+    Question,
+    QuestionBankVersion,
+    SeedRun,
+    User,
+    compute_content_hash,
+    initial_rating,
+    question_text_filter,
+)
 from dotenv import load_dotenv
-from sqlalchemy import delete, select
+from sqlalchemy import bindparam, case, delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -24,6 +39,7 @@ if not DATABASE_URL:
 
 print(f"Using database URL: {DATABASE_URL}")
 engine = create_async_engine(DATABASE_URL, echo=True)
+slow_query_log.install(engine, source="seed")
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 # Paths configuration - simpler now that seeds are at the project root
@@ -32,6 +48,16 @@ INITIAL_SEEDS = os.path.join(BASE_DIR, "initial")
 UPDATE_SEEDS = os.path.join(BASE_DIR, "updates")
 TEST_SEEDS = os.path.join(BASE_DIR, "tests")
 
+# Rows per bulk statement; keeps bind parameters well under asyncpg's 32767 limit
+BULK_CHUNK_SIZE = 1000
+
+# Seed files with one question object per line instead of a JSON array
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+SEED_FILE_PATTERNS = ("*.json",) + tuple(f"*{suffix}" for suffix in NDJSON_SUFFIXES)
+
+# Validation errors kept per file in streaming mode; the rest are only counted
+MAX_STREAM_ERRORS = 100
+
 
 def validate_question(item: dict) -> tuple[bool, str]:
     """
@@ -96,387 +122,820 @@ async def record_exists(session: AsyncSession, model: type, **kwargs) -> bool:
     return record is not None
 
 
-async def seed_questions_from_file(
-    session: AsyncSession, file_path: str, skip_existing: bool = True
-) -> tuple[int, list, list]:
+def file_checksum(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_path(file_path: str) -> str:
+    """Key seed files under the seeds directory by their relative path, others by absolute path."""
+    absolute = os.path.abspath(file_path)
+    if absolute.startswith(BASE_DIR + os.sep):
+        return os.path.relpath(absolute, BASE_DIR)
+    return absolute
+
+
+class SeedManifest:
+    """
+    Checksums of seed files that were already applied, read from ``seed_runs``.
+
+    A file whose checksum matches its recorded run is skipped unless
+    ``skip_applied`` is False (``--force``); every applied file is recorded
+    with the run's ``skip_existing`` mode. A run that skipped existing
+    questions did not apply the file's changes to them, so it only counts as
+    applied for other runs that skip existing questions too.
+    """
+
+    def __init__(
+        self,
+        applied: dict[str, str],
+        skip_applied: bool = True,
+        skip_existing: bool = True,
+        skipped_existing: set[str] | None = None,
+    ):
+        self.applied = applied
+        self.skip_applied = skip_applied
+        self.skip_existing = skip_existing
+        # Paths whose recorded run skipped existing questions
+        self.skipped_existing = skipped_existing if skipped_existing is not None else set()
+
+    @classmethod
+    async def load(
+        cls, session: AsyncSession, skip_applied: bool = True, skip_existing: bool = True
+    ) -> "SeedManifest":
+        result = await session.execute(
+            select(SeedRun.path, SeedRun.checksum, SeedRun.skip_existing)
+        )
+        applied, skipped_existing = {}, set()
+        for path, checksum, run_skipped_existing in result:
+            applied[path] = checksum
+            if run_skipped_existing:
+                skipped_existing.add(path)
+        return cls(applied, skip_applied, skip_existing, skipped_existing)
+
+    def is_applied(self, file_path: str, checksum: str) -> bool:
+        path = manifest_path(file_path)
+        if not self.skip_applied or self.applied.get(path) != checksum:
+            return False
+        return self.skip_existing or path not in self.skipped_existing
+
+    async def record(
+        self, session: AsyncSession, file_path: str, checksum: str, changes: int
+    ) -> None:
+        path = manifest_path(file_path)
+        values = dict(checksum=checksum, changes=changes, skip_existing=self.skip_existing)
+        if path in self.applied:
+            await session.execute(
+                update(SeedRun).where(SeedRun.path == path).values(**values)
+            )
+        else:
+            session.add(SeedRun(path=path, **values))
+        self.applied[path] = checksum
+        if self.skip_existing:
+            self.skipped_existing.add(path)
+        else:
+            self.skipped_existing.discard(path)
+
+
+async def bump_bank_version(session: AsyncSession) -> None:
     """
-    Seed questions from a JSON file.
+    Increment the question bank version in the seeding transaction.
+
+    The API derives its cache validators (ETags) from this counter, so it must
+    change whenever question or answer content does.
+    """
+    result = await session.execute(
+        update(QuestionBankVersion)
+        .where(QuestionBankVersion.id == BANK_VERSION_ID)
+        .values(version=QuestionBankVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        session.add(QuestionBankVersion(id=BANK_VERSION_ID, version=1))
+
+
+def chunked(items: list, size: int = BULK_CHUNK_SIZE):
+    """Yield successive slices of ``items`` to keep statements under the bind limit."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def question_details(item: dict, level: int, reasons: str | None = None) -> dict:
+    """Build the report entry for an added or updated question."""
+    details = {
+        "question_text": item["question"],
+        "level": level,
+        "answers_count": len(item["answers"]),
+        "correct_answer": next(
+            (a["answer"] for a in item["answers"] if a["correct"]), None
+        ),
+    }
+    if reasons is not None:
+        details["reasons"] = reasons
+    return details
+
+
+def item_content_hash(item: dict, level: int) -> str:
+    return compute_content_hash(
+        item["question"], level, ((a["answer"], a["correct"]) for a in item["answers"])
+    )
+
+
+def answer_rows(question_id: int, item: dict) -> list[dict]:
+    return [
+        {"question_id": question_id, "answer": a["answer"], "correct": a["correct"]}
+        for a in item["answers"]
+    ]
+
+
+async def load_existing_questions(
+    session: AsyncSession, question_texts: list[str]
+) -> dict[str, tuple[int, int, str | None]]:
+    """
+    Fetch the id, level and content hash of every question whose text is in ``question_texts``.
 
     Args:
         session: SQLAlchemy async session
-        file_path: Path to the JSON file containing questions
-        skip_existing: If True, skip questions that already exist.
-                      If False (--force flag), check existing questions and update them if needed.
+        question_texts: Question texts to look up
 
     Returns:
-        tuple: (total_changes, added_questions_details, updated_questions_details)
+        dict: question text -> (id, level, content_hash)
     """
-    try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
+    existing = {}
+    dialect_name = session.bind.dialect.name
+    for chunk in chunked(question_texts):
+        result = await session.execute(
+            select(
+                Question.question, Question.id, Question.level, Question.content_hash
+            ).where(question_text_filter(chunk, dialect_name))
+        )
+        for text, question_id, level, content_hash in result:
+            existing[text] = (question_id, level, content_hash)
+    return existing
 
-        added_questions = []
-        updated_questions = []
 
-        for item in data:
-            # Validate question data
-            is_valid, error_msg = validate_question(item)
-            if not is_valid:
-                print(f"❌ {error_msg} - Skipping this question.")
-                continue
-
-            question_text = item["question"]
-            existing_question = await find_record(
-                session, Question, question=question_text
-            )
+async def load_existing_answers(
+    session: AsyncSession, question_ids: list[int]
+) -> dict[int, list[tuple[str, bool]]]:
+    """
+    Fetch the answers of the given questions.
 
-            # Handle existing questions
-            if existing_question:
-                if skip_existing:
-                    print(f"Question '{question_text}' already exists. Skipping.")
-                    continue
-                else:
-                    # Always check if we need to update the question
-                    level = item.get("level", 10)
-                    if level not in (10, 11, 12):
-                        print(
-                            f"Invalid level {level} for question '{question_text}'. Using default 10."
-                        )
-                        level = 10
-
-                    # Fetch current answers
-                    stmt = select(Answer).filter_by(question_id=existing_question.id)
-                    result = await session.execute(stmt)
-                    existing_answers = result.scalars().all()
-
-                    # Check if we need to update
-                    need_update = False
-                    update_reasons = []
-
-                    # Check if level has changed
-                    if existing_question.level != level:
-                        need_update = True
-                        update_reasons.append(
-                            f"level changed from {existing_question.level} to {level}"
-                        )
-
-                    # Check if answers have changed
-                    if len(existing_answers) != len(item["answers"]):
-                        need_update = True
-                        update_reasons.append(
-                            f"answer count changed from {len(existing_answers)} to {len(item['answers'])}"
-                        )
-                    else:
-                        # Create a map of existing answers for faster lookup
-                        existing_map = {(a.answer, a.correct) for a in existing_answers}
-                        new_map = {(a["answer"], a["correct"]) for a in item["answers"]}
-
-                        if existing_map != new_map:
-                            need_update = True
-                            update_reasons.append(
-                                "answer content or correctness changed"
-                            )
-
-                    if need_update:
-                        reasons = ", ".join(update_reasons)
-                        print(
-                            f"Question '{question_text}' has changes ({reasons}). Updating..."
-                        )
-
-                        # Delete associated answers
-                        await session.execute(
-                            delete(Answer).where(
-                                Answer.question_id == existing_question.id
-                            )
-                        )
-
-                        # Update the level of the existing question
-                        existing_question.level = level
-                        await session.flush()
-
-                        # Add new answers
-                        answer_objs = [
-                            Answer(
-                                question_id=existing_question.id,
-                                answer=a["answer"],
-                                correct=a["correct"],
-                            )
-                            for a in item["answers"]
-                        ]
-                        session.add_all(answer_objs)
-
-                        # Store details about the updated question
-                        updated_questions.append(
-                            {
-                                "question_text": question_text,
-                                "level": level,
-                                "reasons": reasons,
-                                "answers_count": len(item["answers"]),
-                                "correct_answer": next(
-                                    (
-                                        a["answer"]
-                                        for a in item["answers"]
-                                        if a["correct"]
-                                    ),
-                                    None,
-                                ),
-                            }
-                        )
-                    else:
-                        print(
-                            f"Question '{question_text}' already exists with identical data. No update needed."
-                        )
-
-                    continue
-
-            # Get level from the item if available, else default to 10
-            level = item.get("level", 10)
-            if level not in (10, 11, 12):
-                print(
-                    f"Invalid level {level} for question '{question_text}'. Using default 10."
-                )
-                level = 10
+    Args:
+        session: SQLAlchemy async session
+        question_ids: Ids of the questions whose answers to load
 
-            # Validate the question structure
-            is_valid, validation_message = validate_question(item)
-            if not is_valid:
-                print(f"❌ {validation_message}. Skipping question.")
-                continue
+    Returns:
+        dict: question id -> list of (answer text, correct)
+    """
+    answers = {question_id: [] for question_id in question_ids}
+    for chunk in chunked(question_ids):
+        result = await session.execute(
+            select(Answer.question_id, Answer.answer, Answer.correct).where(
+                Answer.question_id.in_(chunk)
+            )
+        )
+        for question_id, text, correct in result:
+            answers[question_id].append((text, correct))
+    return answers
 
-            q = Question(question=question_text, level=level)
-            session.add(q)
-            await session.flush()
 
-            answer_objs = [
-                Answer(question_id=q.id, answer=a["answer"], correct=a["correct"])
-                for a in item["answers"]
-            ]
-            session.add_all(answer_objs)
+async def insert_questions(
+    session: AsyncSession, items: list[tuple[dict, int, str]]
+) -> None:
+    """
+    Insert new questions and their answers with multi-row statements.
 
-            # Store details about the added question
-            added_questions.append(
+    Args:
+        session: SQLAlchemy async session
+        items: (question item, level, content hash) triples for questions not yet in the database
+    """
+    for chunk in chunked(items):
+        result = await session.execute(
+            insert(Question).returning(Question.id, Question.question),
+            [
                 {
-                    "question_text": question_text,
+                    "question": item["question"],
                     "level": level,
-                    "answers_count": len(item["answers"]),
-                    "correct_answer": next(
-                        (a["answer"] for a in item["answers"] if a["correct"]), None
-                    ),
+                    "content_hash": content_hash,
+                    "rating": initial_rating(level),
                 }
-            )
+                for item, level, content_hash in chunk
+            ],
+        )
+        ids_by_text = {text: question_id for question_id, text in result}
 
-        return (
-            len(added_questions) + len(updated_questions),
-            added_questions,
-            updated_questions,
+        rows = [
+            row
+            for item, _, _ in chunk
+            for row in answer_rows(ids_by_text[item["question"]], item)
+        ]
+        if rows:
+            await session.execute(insert(Answer), rows)
+
+
+async def replace_questions(
+    session: AsyncSession, items: list[tuple[int, dict, int, str]]
+) -> None:
+    """
+    Update levels and hashes and replace all answers of changed questions.
+
+    A question moved to another level starts over from that level's initial
+    rating.
+
+    Args:
+        session: SQLAlchemy async session
+        items: (question id, question item, level, content hash) tuples for changed questions
+    """
+    for chunk in chunked(items):
+        question_ids = [question_id for question_id, _, _, _ in chunk]
+        await session.execute(
+            delete(Answer).where(Answer.question_id.in_(question_ids))
+        )
+        level_changed = Question.level != bindparam("b_level")
+        connection = await session.connection()
+        await connection.execute(
+            update(Question.__table__)
+            .where(Question.id == bindparam("b_id"))
+            .values(
+                level=bindparam("b_level"),
+                content_hash=bindparam("b_hash"),
+                rating=case((level_changed, bindparam("b_rating")), else_=Question.rating),
+                rating_attempts=case((level_changed, 0), else_=Question.rating_attempts),
+            ),
+            [
+                {
+                    "b_id": question_id,
+                    "b_level": level,
+                    "b_hash": content_hash,
+                    "b_rating": initial_rating(level),
+                }
+                for question_id, _, level, content_hash in chunk
+            ],
+        )
+        await session.execute(
+            insert(Answer),
+            [
+                row
+                for question_id, item, _, _ in chunk
+                for row in answer_rows(question_id, item)
+            ],
         )
-    except Exception as e:
-        print(f"❌ Error seeding from {file_path}: {e}")
-        return (0, [], [])
 
 
-async def seed_initial_data(
-    session: AsyncSession, skip_existing: bool = True
-) -> tuple[int, list, list]:
+async def update_content_hashes(
+    session: AsyncSession, items: list[tuple[int, str]]
+) -> None:
     """
-    Seed initial data from the initial seeds directory.
+    Store content hashes for questions whose data is unchanged but whose hash is stale.
 
     Args:
         session: SQLAlchemy async session
-        skip_existing: Whether to skip questions that already exist
+        items: (question id, content hash) pairs
+    """
+    for chunk in chunked(items):
+        await session.execute(
+            update(Question),
+            [
+                {"id": question_id, "content_hash": content_hash}
+                for question_id, content_hash in chunk
+            ],
+        )
+
+
+@dataclass
+class SeedEntry:
+    item: dict
+    level: int
+    content_hash: str
+    source: str
+
+
+@dataclass
+class ParsedSeedFile:
+    path: str
+    checksum: str
+    entries: list[SeedEntry] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+class SeedValidationError(Exception):
+    def __init__(self, errors: list[str]):
+        super().__init__(f"{len(errors)} seed validation error(s)")
+        self.errors = errors
+
+
+def iter_json_array(f, read_size: int = 1 << 16):
+    """
+    Yield the elements of a top-level JSON array without loading the whole file.
+
+    Only the current, not yet decoded tail of the file is buffered. The array
+    is checked as strictly as ``json.load`` would: elements must be separated
+    by exactly one comma and nothing but whitespace may follow the closing
+    bracket.
+
+    Raises:
+        ValueError: If the file is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(read_size)
+    eof = not buffer
+    pos = 0
+    # What may come next: "[" to open, "first" element or "]" after it,
+    # "," or "]" after an element, a "value" after a comma, "end" once closed
+    expect = "["
+
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer = f.read(read_size)
+            eof = not buffer
+            pos = 0
+
+        if pos >= len(buffer):
+            if expect == "end":
+                return
+            raise ValueError("Unexpected end of file in JSON array")
+
+        char = buffer[pos]
+        if expect == "end":
+            raise ValueError("Extra data after the JSON array")
+        if expect == "[":
+            if char != "[":
+                raise ValueError("Expected a JSON array of questions")
+            pos += 1
+            expect = "first"
+            continue
+        if expect == ",":
+            if char == "]":
+                pos += 1
+                expect = "end"
+            elif char == ",":
+                pos += 1
+                expect = "value"
+            else:
+                raise ValueError("Expected ',' or ']' between array elements")
+            continue
+        if char == "]" and expect == "first":
+            pos += 1
+            expect = "end"
+            continue
+        if char in ",]":
+            raise ValueError("Expected a value in JSON array")
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # A value that touches the end of the buffer may have been cut short
+        if end is None or (end == len(buffer) and not eof):
+            more = f.read(read_size)
+            eof = not more
+            buffer = buffer[pos:] + more
+            pos = 0
+            continue
+
+        yield value
+        buffer = buffer[end:]
+        pos = 0
+        expect = ","
+
+
+def iter_seed_items(file_path: str):
+    """Yield the question items of a JSON array or NDJSON seed file one at a time."""
+    with open(file_path, "r") as f:
+        if file_path.endswith(NDJSON_SUFFIXES):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+
+def build_seed_entry(
+    item, file_path: str
+) -> tuple[SeedEntry | None, str | None, str | None]:
+    """
+    Validate one seed item and turn it into an entry.
 
     Returns:
-        tuple: (total_changes, added_questions_details, updated_questions_details)
+        tuple: (entry, error_message, warning_message); entry is None if invalid
     """
-    total_changes = 0
-    added_questions_details = []
-    updated_questions_details = []
+    if not isinstance(item, dict):
+        return None, "Seed item is not a JSON object", None
+    is_valid, error_msg = validate_question(item)
+    if not is_valid:
+        return None, error_msg, None
+
+    warning = None
+    level = item.get("level", 10)
+    if level not in (10, 11, 12):
+        warning = f"Invalid level {level} for question '{item['question']}'. Using default 10."
+        level = 10
+    return SeedEntry(item, level, item_content_hash(item, level), file_path), None, warning
+
+
+def parse_seed_file(file_path: str, checksum: str) -> ParsedSeedFile:
+    """
+    Parse and validate a seed file without touching the database.
 
-    # Find all JSON files in the initial directory
-    seed_files = glob.glob(os.path.join(INITIAL_SEEDS, "*.json"))
+    Runs in a worker process, so it only returns data; problems are collected
+    in ``errors`` (invalid questions, unreadable JSON) and ``warnings``
+    (defaulted levels) instead of being printed. Within a file the last copy
+    of a question wins.
+
+    Args:
+        file_path: Path to the JSON or NDJSON file containing questions
+        checksum: The file's checksum, carried through for the manifest
+
+    Returns:
+        ParsedSeedFile: Validated entries plus any errors and warnings
+    """
+    parsed = ParsedSeedFile(path=file_path, checksum=checksum)
+    entries = {}
+    try:
+        for index, item in enumerate(iter_seed_items(file_path), 1):
+            entry, error_msg, warning = build_seed_entry(item, file_path)
+            if entry is None:
+                parsed.errors.append(f"{file_path} #{index}: {error_msg}")
+                continue
+            if warning:
+                parsed.warnings.append(warning)
+            entries[entry.item["question"]] = entry
+    except (OSError, ValueError) as e:
+        parsed.errors.append(f"{file_path}: {e}")
+        return parsed
 
-    for seed_file in seed_files:
-        print(f"Seeding from {seed_file}...")
-        changes, added, updated = await seed_questions_from_file(
-            session, seed_file, skip_existing
+    parsed.entries = list(entries.values())
+    return parsed
+
+
+def check_seed_file(file_path: str, checksum: str) -> ParsedSeedFile:
+    """
+    Validate a seed file in one streaming pass without keeping its questions.
+
+    Used by streaming mode, so memory stays flat: only the first
+    ``MAX_STREAM_ERRORS`` errors and warnings are kept, followed by a count of
+    the rest.
+
+    Args:
+        file_path: Path to the JSON or NDJSON file containing questions
+        checksum: The file's checksum, carried through for the manifest
+
+    Returns:
+        ParsedSeedFile: Errors and warnings, with no entries
+    """
+    parsed = ParsedSeedFile(path=file_path, checksum=checksum)
+    error_count = warning_count = 0
+    try:
+        for index, item in enumerate(iter_seed_items(file_path), 1):
+            _, error_msg, warning = build_seed_entry(item, file_path)
+            if error_msg:
+                error_count += 1
+                if error_count <= MAX_STREAM_ERRORS:
+                    parsed.errors.append(f"{file_path} #{index}: {error_msg}")
+            if warning:
+                warning_count += 1
+                if warning_count <= MAX_STREAM_ERRORS:
+                    parsed.warnings.append(warning)
+    except (OSError, ValueError) as e:
+        parsed.errors.append(f"{file_path}: {e}")
+
+    if error_count > MAX_STREAM_ERRORS:
+        parsed.errors.append(
+            f"{file_path}: ... and {error_count - MAX_STREAM_ERRORS} more errors"
         )
-        total_changes += changes
-        added_questions_details.extend(added)
-        updated_questions_details.extend(updated)
+    if warning_count > MAX_STREAM_ERRORS:
+        parsed.warnings.append(
+            f"... and {warning_count - MAX_STREAM_ERRORS} more invalid levels"
+        )
+    return parsed
 
-    # Always make sure test_user exists
-    if not await record_exists(session, User, username="test_user"):
-        session.add(User(username="test_user"))
-        print("Added test_user")
 
-    return (total_changes, added_questions_details, updated_questions_details)
+async def parse_seed_files(
+    files: list[tuple[str, str]], workers: int | None = None, parser=parse_seed_file
+) -> list[ParsedSeedFile]:
+    """
+    Parse and validate seed files, in a process pool when there is more than one.
 
+    Args:
+        files: (file path, checksum) pairs, in apply order
+        workers: Maximum worker processes (default: CPU count)
+        parser: parse_seed_file, or check_seed_file to validate without keeping entries
 
-async def seed_update(
-    session: AsyncSession, update_file: str, skip_existing: bool = False
-) -> tuple[int, list, list]:
+    Returns:
+        list: ParsedSeedFile results in the same order as ``files``
+    """
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    if workers <= 1:
+        return [parser(path, checksum) for path, checksum in files]
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, parser, path, checksum)
+                for path, checksum in files
+            )
+        )
+
+
+def pending_seed_files(
+    file_paths: list[str], manifest: SeedManifest | None
+) -> tuple[list[tuple[str, str]], list[str]]:
+    """
+    Checksum seed files and drop the ones the manifest has already applied.
+
+    Returns:
+        tuple: ((file path, checksum) pairs still to apply, errors for unreadable files)
+    """
+    errors = []
+    pending = []
+    for file_path in file_paths:
+        try:
+            checksum = file_checksum(file_path)
+        except OSError as e:
+            errors.append(f"{file_path}: {e}")
+            continue
+        if manifest is not None and manifest.is_applied(file_path, checksum):
+            print(f"⏭️  {manifest_path(file_path)} already applied. Skipping.")
+            continue
+        pending.append((file_path, checksum))
+    return pending, errors
+
+
+def collect_validation_errors(parsed_files: list[ParsedSeedFile], errors: list[str]) -> None:
+    """
+    Print per-file validation results and raise if any file had errors.
+
+    Raises:
+        SeedValidationError: If ``errors`` or any parsed file has errors
     """
-    Seed data from a specific update file.
-    For update files, we always check existing questions for differences and update if needed.
+    for parsed in parsed_files:
+        print(f"Validated {parsed.path}")
+        for warning in parsed.warnings:
+            print(warning)
+        errors.extend(parsed.errors)
+    if errors:
+        raise SeedValidationError(errors)
+
+
+def merge_seed_files(parsed_files: list[ParsedSeedFile]) -> list[SeedEntry]:
+    """
+    Merge entries from several files into one plan, one entry per question text.
+
+    Files are applied in order, so when two files define the same question the
+    later file wins, matching what applying them one after another would do.
 
     Args:
-        session: SQLAlchemy async session
-        update_file: Path to the update file
-        skip_existing: Whether to skip questions that already exist (default: False for update files)
+        parsed_files: Parsed files in apply order
 
     Returns:
-        tuple: (total_changes, added_questions_details, updated_questions_details)
+        list: Merged entries
     """
-    print(f"Applying update from {update_file}...")
-    return await seed_questions_from_file(session, update_file, skip_existing)
+    merged: dict[str, SeedEntry] = {}
+    for parsed in parsed_files:
+        for entry in parsed.entries:
+            question_text = entry.item["question"]
+            previous = merged.get(question_text)
+            if (
+                previous is not None
+                and previous.source != entry.source
+                and previous.content_hash != entry.content_hash
+            ):
+                print(
+                    f"⚠️  Question '{question_text}' differs between "
+                    f"{manifest_path(previous.source)} and {manifest_path(entry.source)}; "
+                    f"using {manifest_path(entry.source)}."
+                )
+            merged[question_text] = entry
+    return list(merged.values())
 
 
-async def seed_all_updates(
-    session: AsyncSession, skip_existing: bool = False
+async def apply_seed_entries(
+    session: AsyncSession,
+    entries: list[SeedEntry],
+    skip_existing: bool = True,
+    verbose: bool = True,
 ) -> tuple[int, list, list]:
     """
-    Seed all update files in order.
-    For update files, we always check existing questions for differences and update if needed.
+    Write a merged seed plan to the database.
+
+    Existing questions are preloaded in bulk and compared by content hash, so
+    answers are only fetched for questions whose hash differs. New questions
+    and answers are written with multi-row inserts and changed questions have
+    their answers replaced with a single delete per chunk; either bumps the
+    question bank version. Database errors
+    propagate so the caller's transaction is rolled back.
 
     Args:
         session: SQLAlchemy async session
-        skip_existing: Whether to skip questions that already exist (default: False for update files)
+        entries: Validated, de-duplicated seed entries
+        skip_existing: If True, skip questions that already exist.
+                      If False (--force flag), check existing questions and update them if needed.
+        verbose: Print a line for every skipped or updated question
 
     Returns:
         tuple: (total_changes, added_questions_details, updated_questions_details)
     """
-    total_changes = 0
-    added_questions_details = []
-    updated_questions_details = []
-
-    # Find all JSON files in the updates directory
-    update_files = sorted(glob.glob(os.path.join(UPDATE_SEEDS, "*.json")))
+    items = {entry.item["question"]: entry for entry in entries}
+    existing = await load_existing_questions(session, list(items))
+
+    added_questions = []
+    updated_questions = []
+    to_insert = []
+    candidates = []
+
+    for question_text, entry in items.items():
+        item, level, content_hash = entry.item, entry.level, entry.content_hash
+
+        if question_text not in existing:
+            to_insert.append((item, level, content_hash))
+            added_questions.append(question_details(item, level))
+            continue
+
+        if skip_existing:
+            if verbose:
+                print(f"Question '{question_text}' already exists. Skipping.")
+            continue
+
+        question_id, current_level, current_hash = existing[question_text]
+        if current_hash == content_hash:
+            if verbose:
+                print(
+                    f"Question '{question_text}' already exists with identical data. No update needed."
+                )
+            continue
+        candidates.append((question_id, current_level, item, level, content_hash))
 
-    for update_file in update_files:
-        changes, added, updated = await seed_update(session, update_file, skip_existing)
-        total_changes += changes
-        added_questions_details.extend(added)
-        updated_questions_details.extend(updated)
+    # Only questions whose hash differs (or was never stored) need their answers
+    existing_answers = await load_existing_answers(
+        session, [question_id for question_id, *_ in candidates]
+    )
+    to_replace = []
+    to_rehash = []
+
+    for question_id, current_level, item, level, content_hash in candidates:
+        question_text = item["question"]
+        current_answers = existing_answers[question_id]
+
+        update_reasons = []
+        if current_level != level:
+            update_reasons.append(f"level changed from {current_level} to {level}")
+        if len(current_answers) != len(item["answers"]):
+            update_reasons.append(
+                f"answer count changed from {len(current_answers)} to {len(item['answers'])}"
+            )
+        elif set(current_answers) != {
+            (a["answer"], a["correct"]) for a in item["answers"]
+        }:
+            update_reasons.append("answer content or correctness changed")
 
-    return (total_changes, added_questions_details, updated_questions_details)
+        if not update_reasons:
+            if verbose:
+                print(
+                    f"Question '{question_text}' already exists with identical data. No update needed."
+                )
+            to_rehash.append((question_id, content_hash))
+            continue
+
+        reasons = ", ".join(update_reasons)
+        if verbose:
+            print(f"Question '{question_text}' has changes ({reasons}). Updating...")
+        to_replace.append((question_id, item, level, content_hash))
+        updated_questions.append(question_details(item, level, reasons))
+
+    await insert_questions(session, to_insert)
+    await replace_questions(session, to_replace)
+    await update_content_hashes(session, to_rehash)
+    if to_insert or to_replace:
+        await bump_bank_version(session)
+
+    return (
+        len(added_questions) + len(updated_questions),
+        added_questions,
+        updated_questions,
+    )
 
 
-async def seed_test_data(session: AsyncSession) -> tuple[int, list, list]:
+async def seed_files(
+    session: AsyncSession,
+    file_paths: list[str],
+    skip_existing: bool = True,
+    manifest: SeedManifest | None = None,
+    workers: int | None = None,
+) -> tuple[int, list, list]:
     """
-    Seed test data for testing environments.
+    Seed questions from several files as one validated, merged plan.
+
+    Every pending file is parsed and validated up front (in parallel), and
+    nothing is written if any file has errors. Questions defined in several
+    files are resolved in favour of the last file, and the merged plan is
+    applied with the bulk writer.
 
     Args:
         session: SQLAlchemy async session
+        file_paths: Seed files in apply order
+        skip_existing: If True, skip questions that already exist.
+                      If False (--force flag), check existing questions and update them if needed.
+        manifest: Applied-seed manifest; files it has already seen unchanged are skipped
+        workers: Maximum worker processes for parsing (default: CPU count)
 
     Returns:
         tuple: (total_changes, added_questions_details, updated_questions_details)
+
+    Raises:
+        SeedValidationError: If any file could not be read or has invalid questions
     """
-    total_changes = 0
-    added_questions_details = []
-    updated_questions_details = []
+    pending, errors = pending_seed_files(file_paths, manifest)
+    parsed_files = await parse_seed_files(pending, workers)
+    collect_validation_errors(parsed_files, errors)
 
-    # Find all JSON files in the test directory
-    test_files = glob.glob(os.path.join(TEST_SEEDS, "*.json"))
+    total_changes, added, updated = await apply_seed_entries(
+        session, merge_seed_files(parsed_files), skip_existing
+    )
 
-    for test_file in test_files:
-        print(f"Seeding test data from {test_file}...")
-        changes, added, updated = await seed_questions_from_file(
-            session, test_file, skip_existing=True
+    if manifest is not None:
+        source_by_text = {
+            entry.item["question"]: entry.source
+            for parsed in parsed_files
+            for entry in parsed.entries
+        }
+        changes_by_source = Counter(
+            source_by_text[details["question_text"]] for details in added + updated
         )
-        total_changes += changes
-        added_questions_details.extend(added)
-        updated_questions_details.extend(updated)
+        for parsed in parsed_files:
+            await manifest.record(
+                session, parsed.path, parsed.checksum, changes_by_source[parsed.path]
+            )
 
-    return (total_changes, added_questions_details, updated_questions_details)
+    return (total_changes, added, updated)
 
 
-async def run_seeding(args: argparse.Namespace) -> None:
+class SeedReport:
     """
-    Run the seeding operations based on command line arguments.
+    Running totals of added and updated questions for the seeding report.
 
-    Args:
-        args: Command line arguments from argparse
+    Keeps the details of at most ``sample_size`` questions of each kind (all
+    of them when ``sample_size`` is None), so streaming large files does not
+    grow the report with the file.
     """
-    async with AsyncSessionLocal() as session:
-        all_added_questions = []
-        all_updated_questions = []
-
-        if args.all:
-            print("🌱 Seeding initial data...")
-            _, added, updated = await seed_initial_data(session, not args.force)
-            all_added_questions.extend(added)
-            all_updated_questions.extend(updated)
-
-            print("🌱 Seeding updates...")
-            _, added, updated = await seed_all_updates(session, not args.force)
-            all_added_questions.extend(added)
-            all_updated_questions.extend(updated)
-
-        elif args.initial:
-            print("🌱 Seeding initial data...")
-            _, added, updated = await seed_initial_data(session, not args.force)
-            all_added_questions.extend(added)
-            all_updated_questions.extend(updated)
-
-        elif args.updates:
-            print("🌱 Seeding all updates...")
-            # Always check for updates, so setting skip_existing=False for update files
-            _, added, updated = await seed_all_updates(session, skip_existing=False)
-            all_added_questions.extend(added)
-            all_updated_questions.extend(updated)
-
-        elif args.update_file:
-            print(f"🌱 Seeding from update file: {args.update_file}")
-            # Always check for updates, so setting skip_existing=False for update files
-            _, added, updated = await seed_update(
-                session, args.update_file, skip_existing=False
-            )
-            all_added_questions.extend(added)
-            all_updated_questions.extend(updated)
-
-        elif args.test_data:
-            print("🌱 Seeding test data...")
-            _, added, updated = await seed_test_data(session)
-            all_added_questions.extend(added)
-            all_updated_questions.extend(updated)
-
-        elif args.file:
-            print(f"🌱 Seeding from file: {args.file}")
-            _, added, updated = await seed_questions_from_file(
-                session, args.file, not args.force
-            )
-            all_added_questions.extend(added)
-            all_updated_questions.extend(updated)
-
-        await session.commit()
-
-        # Generate detailed seeding report
-        added_count = len(all_added_questions)
-        updated_count = len(all_updated_questions)
 
+    def __init__(self, sample_size: int | None = None):
+        self.sample_size = sample_size
+        self.added_count = 0
+        self.updated_count = 0
+        self.added = []
+        self.updated = []
+
+    def _keep(self, sample: list, details: list) -> None:
+        if self.sample_size is None:
+            sample.extend(details)
+        else:
+            sample.extend(details[: max(self.sample_size - len(sample), 0)])
+
+    def add(self, added: list, updated: list) -> None:
+        self.added_count += len(added)
+        self.updated_count += len(updated)
+        self._keep(self.added, added)
+        self._keep(self.updated, updated)
+
+    def print(self) -> None:
         print("\n✅ SEEDING REPORT")
         print("================")
 
-        if added_count > 0:
+        if self.added_count > 0:
             print(
-                f"\n📝 Added {added_count} new question{'s' if added_count != 1 else ''}:"
+                f"\n📝 Added {self.added_count} new question{'s' if self.added_count != 1 else ''}:"
             )
-            for i, q in enumerate(all_added_questions, 1):
+            if len(self.added) < self.added_count:
+                print(f"  (showing the first {len(self.added)})")
+            for i, q in enumerate(self.added, 1):
                 print(f"  {i}. Level {q['level']}: \"{q['question_text']}\"")
                 print(f"     Correct answer: \"{q['correct_answer']}\"")
                 print(f"     Total answers: {q['answers_count']}")
 
-        if updated_count > 0:
+        if self.updated_count > 0:
             print(
-                f"\n🔄 Updated {updated_count} existing question{'s' if updated_count != 1 else ''}:"
+                f"\n🔄 Updated {self.updated_count} existing question{'s' if self.updated_count != 1 else ''}:"
             )
-            for i, q in enumerate(all_updated_questions, 1):
+            if len(self.updated) < self.updated_count:
+                print(f"  (showing the first {len(self.updated)})")
+            for i, q in enumerate(self.updated, 1):
                 print(f"  {i}. Level {q['level']}: \"{q['question_text']}\"")
                 print(f"     Reason: {q['reasons']}")
                 print(f"     Correct answer: \"{q['correct_answer']}\"")
                 print(f"     Total answers: {q['answers_count']}")
 
-        if added_count == 0 and updated_count == 0:
+        if self.added_count == 0 and self.updated_count == 0:
             print(
                 "\n📊 No changes were made (all questions already exist with identical data)"
             )
@@ -484,6 +943,258 @@ async def run_seeding(args: argparse.Namespace) -> None:
         print("\n================\n")
 
 
+async def stream_seed_file(
+    session: AsyncSession,
+    file_path: str,
+    skip_existing: bool,
+    report: SeedReport,
+    batch_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """
+    Apply an already validated seed file in fixed-size batches while reading it.
+
+    Args:
+        session: SQLAlchemy async session
+        file_path: Path to the JSON or NDJSON file containing questions
+        skip_existing: Whether to skip questions that already exist
+        report: Report to add the batch results to
+        batch_size: Questions per batch
+
+    Returns:
+        int: Number of questions added or updated
+    """
+    total_changes = 0
+    batch: dict[str, SeedEntry] = {}
+
+    async def flush() -> None:
+        nonlocal total_changes
+        changes, added, updated = await apply_seed_entries(
+            session, list(batch.values()), skip_existing, verbose=False
+        )
+        total_changes += changes
+        report.add(added, updated)
+        batch.clear()
+
+    for item in iter_seed_items(file_path):
+        entry, _, _ = build_seed_entry(item, file_path)
+        # Keyed by text so a question repeated within a batch keeps its last copy
+        batch[entry.item["question"]] = entry
+        if len(batch) >= batch_size:
+            await flush()
+            print(f"  {manifest_path(file_path)}: {total_changes} changes so far")
+    if batch:
+        await flush()
+    return total_changes
+
+
+async def stream_seed_files(
+    session: AsyncSession,
+    file_paths: list[str],
+    skip_existing: bool,
+    report: SeedReport,
+    manifest: SeedManifest | None = None,
+    workers: int | None = None,
+    batch_size: int = BULK_CHUNK_SIZE,
+) -> None:
+    """
+    Seed very large files with flat memory use.
+
+    Every pending file is first validated in a streaming pass (in parallel),
+    and nothing is written if any file has errors. Files are then read again
+    and applied one after another in batches of ``batch_size`` questions, so
+    a question defined in several files ends up with the last file's data.
+    Duplicates are only collapsed within a batch: when existing questions are
+    skipped, a later copy in another batch is skipped too.
+
+    Args:
+        session: SQLAlchemy async session
+        file_paths: Seed files in apply order
+        skip_existing: Whether to skip questions that already exist
+        report: Report collecting counts and a sample of changed questions
+        manifest: Applied-seed manifest; files it has already seen unchanged are skipped
+        workers: Maximum worker processes for validation (default: CPU count)
+        batch_size: Questions per batch
+
+    Raises:
+        SeedValidationError: If any file could not be read or has invalid questions
+    """
+    pending, errors = pending_seed_files(file_paths, manifest)
+    checked_files = await parse_seed_files(pending, workers, parser=check_seed_file)
+    collect_validation_errors(checked_files, errors)
+
+    for checked in checked_files:
+        print(f"Streaming {checked.path}...")
+        changes = await stream_seed_file(
+            session, checked.path, skip_existing, report, batch_size
+        )
+        if manifest is not None:
+            await manifest.record(session, checked.path, checked.checksum, changes)
+
+
+async def ensure_test_user(session: AsyncSession) -> None:
+    """Make sure the test_user account exists."""
+    if not await record_exists(session, User, username="test_user"):
+        session.add(User(username="test_user"))
+        print("Added test_user")
+
+
+def seed_files_in(directory: str) -> list[str]:
+    """Return the JSON and NDJSON seed files in a directory, sorted by name."""
+    return sorted(
+        path
+        for pattern in SEED_FILE_PATTERNS
+        for path in glob.glob(os.path.join(directory, pattern))
+    )
+
+
+def initial_seed_files() -> list[str]:
+    return seed_files_in(INITIAL_SEEDS)
+
+
+def update_seed_files() -> list[str]:
+    return seed_files_in(UPDATE_SEEDS)
+
+
+def test_seed_files() -> list[str]:
+    return seed_files_in(TEST_SEEDS)
+
+
+async def run_seeding(args: argparse.Namespace) -> bool:
+    """
+    Run the seeding operations based on command line arguments.
+
+    All files selected by the arguments are validated and merged into one plan
+    and applied in a single transaction.
+
+    Args:
+        args: Command line arguments from argparse
+
+    Returns:
+        bool: False if validation failed and nothing was written
+    """
+    if args.all:
+        print("🌱 Seeding initial data and updates...")
+        file_paths = initial_seed_files() + update_seed_files()
+        skip_existing = not args.force
+    elif args.initial:
+        print("🌱 Seeding initial data...")
+        file_paths = initial_seed_files()
+        skip_existing = not args.force
+    elif args.updates:
+        print("🌱 Seeding all updates...")
+        # Always check for updates, so setting skip_existing=False for update files
+        file_paths = update_seed_files()
+        skip_existing = False
+    elif args.update_file:
+        print(f"🌱 Seeding from update file: {args.update_file}")
+        # Always check for updates, so setting skip_existing=False for update files
+        file_paths = [args.update_file]
+        skip_existing = False
+    elif args.test_data:
+        print("🌱 Seeding test data...")
+        file_paths = test_seed_files()
+        skip_existing = True
+    else:
+        print(f"🌱 Seeding from file: {args.file}")
+        file_paths = [args.file]
+        skip_existing = not args.force
+
+    async with AsyncSessionLocal() as session:
+        # --force re-checks every file, even ones already applied unchanged
+        manifest = await SeedManifest.load(
+            session, skip_applied=not args.force, skip_existing=skip_existing
+        )
+
+        try:
+            if args.stream:
+                report = SeedReport(sample_size=args.report_sample)
+                await stream_seed_files(
+                    session,
+                    file_paths,
+                    skip_existing,
+                    report,
+                    manifest,
+                    args.workers,
+                    args.batch_size,
+                )
+            else:
+                report = SeedReport()
+                _, added, updated = await seed_files(
+                    session, file_paths, skip_existing, manifest, args.workers
+                )
+                report.add(added, updated)
+        except SeedValidationError as e:
+            print("\n❌ VALIDATION REPORT")
+            print("================")
+            for error in e.errors:
+                print(f"  - {error}")
+            print(f"\n{len(e.errors)} problem(s) found; nothing was written.")
+            print("\n================\n")
+            return False
+
+        if args.all or args.initial:
+            # Always make sure test_user exists
+            await ensure_test_user(session)
+
+        await session.commit()
+
+        # Generate detailed seeding report
+        report.print()
+
+    return True
+
+
+async def show_status() -> None:
+    """Print whether each seed file is applied, changed since it was applied, or pending."""
+    async with AsyncSessionLocal() as session:
+        manifest = await SeedManifest.load(session)
+
+    print("\n📋 SEED STATUS")
+    print("================")
+    pending = 0
+    for directory in (INITIAL_SEEDS, UPDATE_SEEDS, TEST_SEEDS):
+        for seed_file in seed_files_in(directory):
+            path = manifest_path(seed_file)
+            recorded = manifest.applied.get(path)
+            if recorded is None:
+                state = "⏳ pending"
+                pending += 1
+            elif recorded != file_checksum(seed_file):
+                state = "✏️  changed since applied"
+                pending += 1
+            elif path in manifest.skipped_existing:
+                state = "☑️  applied to new questions"
+            else:
+                state = "✅ applied"
+            print(f"  {state:<28} {path}")
+    print(f"\n{pending} file{'s' if pending != 1 else ''} to apply")
+    print("================\n")
+
+
+def print_slow_queries() -> None:
+    """Print the statements slower than SLOW_QUERY_THRESHOLD_MS, with their plans."""
+    entries = slow_query_log.report()["entries"]
+    if not entries:
+        return
+    print("\n🐢 SLOW QUERIES")
+    print("================")
+    for entry in entries:
+        print(f"  {entry['duration_ms']:.1f} ms: {' '.join(entry['statement'].split())[:300]}")
+        for line in entry["plan"] or []:
+            print(f"     {line}")
+    print("\n================\n")
+
+
+async def run_and_dispose(coro):
+    """Await ``coro`` and then close the engine's pooled connections."""
+    try:
+        return await coro
+    finally:
+        await slow_query_log.drain()
+        print_slow_queries()
+        await engine.dispose()
+
+
 def create_update_file(name: str) -> str:
     """
     Create a new update seed file with today's date.
@@ -510,7 +1221,8 @@ def create_update_file(name: str) -> str:
     return filepath
 
 
-if __name__ == "__main__":
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for the seeding script."""
     parser = argparse.ArgumentParser(
         description="Seed the database with questions and answers"
     )
@@ -526,19 +1238,55 @@ if __name__ == "__main__":
     group.add_argument("--file", type=str, help="Seed from a specific file")
     group.add_argument("--test-data", action="store_true", help="Seed with test data")
     group.add_argument("--create", type=str, help="Create a new update seed file")
+    group.add_argument(
+        "--status",
+        action="store_true",
+        help="Show which seed files are applied, changed or pending",
+    )
 
     # Options
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Force check and update records that already exist (only affects initial data, not update files)",
+        help="Force check and update records that already exist, including seed files already applied unchanged",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read seed files incrementally and write in batches, for very large files",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BULK_CHUNK_SIZE,
+        help=f"Questions per batch in --stream mode (default: {BULK_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--report-sample",
+        type=int,
+        default=20,
+        help="Added/updated questions listed in the --stream report (default: 20)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for parsing and validating seed files (default: CPU count)",
+    )
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
 
     # Handle creating a new update file
     if args.create:
         create_update_file(args.create)
+    elif args.status:
+        asyncio.run(run_and_dispose(show_status()))
     else:
         # Run the seeding operations
-        asyncio.run(run_seeding(args))
+        if not asyncio.run(run_and_dispose(run_seeding(args))):
+            sys.exit(1)
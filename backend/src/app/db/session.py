@@ -1,18 +1,171 @@
-import os
+import logging
+import random
+import time
+from typing import Dict, Optional
 
+from app.db.slow_queries import slow_query_log
 from dotenv import load_dotenv
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable is not set")
-engine = create_async_engine(DATABASE_URL, echo=True)
+sql_logger = logging.getLogger("app.db.sql")
+
+
+class DatabaseSettings(BaseSettings):
+    url: Optional[str] = Field(default=None, alias="DATABASE_URL")
+    pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE_SECONDS")
+    statement_timeout_ms: Optional[int] = Field(
+        default=None, alias="DB_STATEMENT_TIMEOUT_MS"
+    )
+    statement_cache_size: int = Field(default=100, alias="DB_STATEMENT_CACHE_SIZE")
+    echo: bool = Field(default=False, alias="DB_ECHO")
+    sql_log_sample_rate: float = Field(default=0.0, alias="DB_SQL_LOG_SAMPLE_RATE")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_database_settings() -> DatabaseSettings:
+    return DatabaseSettings()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts take and how far into overflow
+    it has gone. A checkout's time includes opening a new connection when the
+    pool has none idle.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_overflow = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+            self.peak_overflow = max(self.peak_overflow, self._overflow)
+            return connection
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def recreate(self):
+        # Keep the counters when the pool is rebuilt after a disconnect
+        new_pool = super().recreate()
+        new_pool.__dict__.update(
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            total_wait_seconds=self.total_wait_seconds,
+            max_wait_seconds=self.max_wait_seconds,
+            peak_overflow=self.peak_overflow,
+        )
+        return new_pool
+
+
+def build_engine(settings: DatabaseSettings):
+    if not settings.url:
+        raise ValueError("DATABASE_URL environment variable is not set")
+
+    url = make_url(settings.url)
+    kwargs = {"echo": settings.echo, "pool_pre_ping": settings.pool_pre_ping}
+    # In-memory SQLite needs its single-connection default pool
+    if url.database not in (None, "", ":memory:"):
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+        )
+    if url.get_driver_name() == "asyncpg":
+        server_settings = {}
+        if settings.statement_timeout_ms:
+            server_settings["statement_timeout"] = str(settings.statement_timeout_ms)
+        # Set DB_STATEMENT_CACHE_SIZE=0 behind pgbouncer in transaction mode
+        kwargs["connect_args"] = {
+            "statement_cache_size": settings.statement_cache_size,
+            "server_settings": server_settings,
+        }
+
+    engine = create_async_engine(settings.url, **kwargs)
+    if settings.sql_log_sample_rate > 0:
+        install_sql_sampling(engine, settings.sql_log_sample_rate)
+    return engine
+
+
+def install_sql_sampling(engine, rate: float) -> None:
+    """Log roughly ``rate`` of all statements, with their duration, to ``app.db.sql``."""
+    if not sql_logger.handlers:
+        sql_logger.addHandler(logging.StreamHandler())
+    sql_logger.setLevel(logging.INFO)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if random.random() < rate:
+            context.sql_sample_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def log_sample(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "sql_sample_start", None)
+        if start is not None:
+            sql_logger.info(
+                "%.2f ms: %s %.200r",
+                (time.perf_counter() - start) * 1000,
+                " ".join(statement.split()),
+                parameters,
+            )
+
+
+engine = build_engine(get_database_settings())
+slow_query_log.install(engine, source="api")
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def get_pool_stats() -> Dict:
+    pool = engine.sync_engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, TimedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            peak_overflow=pool.peak_overflow,
+            max_overflow=pool._max_overflow,
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            total_wait_seconds=pool.total_wait_seconds,
+            max_wait_seconds=pool.max_wait_seconds,
+            avg_wait_ms=(
+                pool.total_wait_seconds / pool.checkouts * 1000
+                if pool.checkouts
+                else 0.0
+            ),
+        )
+    return stats
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import event
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+MAX_PARAMS_CHARS = 500
+MAX_CONCURRENT_EXPLAINS = 2
+EXPLAIN_COOLDOWN_SECONDS = 60.0
+
+# Route template of the request being served, set by a router dependency
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+
+class SlowQuerySettings(BaseSettings):
+    enabled: bool = Field(default=False, alias="SLOW_QUERY_LOG_ENABLED")
+    threshold_ms: float = Field(default=200.0, alias="SLOW_QUERY_THRESHOLD_MS")
+    max_entries: int = Field(default=200, alias="SLOW_QUERY_LOG_SIZE")
+    explain: bool = Field(default=True, alias="SLOW_QUERY_EXPLAIN")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_slow_query_settings() -> SlowQuerySettings:
+    return SlowQuerySettings()
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: str
+    duration_ms: float
+    source: str
+    route: Optional[str]
+    recorded_at: float
+    plan: Optional[List[str]] = None
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of statements that ran longer than ``threshold_ms``.
+
+    ``install`` hooks an engine's cursor events; the API installs it on its own
+    engine and the seed scripts on theirs. Plans are captured afterwards with
+    ``EXPLAIN`` (never ``ANALYZE``) on a separate pooled connection in a
+    background task, so the slow request is not delayed further. The same
+    statement text is explained at most once per cooldown period.
+    """
+
+    def __init__(self, settings: SlowQuerySettings):
+        self.settings = settings
+        self.entries: "deque[SlowQuery]" = deque(maxlen=settings.max_entries)
+        self.recorded = 0
+        self._explained_at: Dict[str, float] = {}
+        self._explains: set = set()
+
+    def install(self, engine, source: str) -> None:
+        if not self.settings.enabled:
+            return
+        sync_engine = engine.sync_engine
+        threshold = self.settings.threshold_ms / 1000
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def start_timer(conn, cursor, statement, parameters, context, executemany):
+            context.slow_query_start = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def check_duration(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - context.slow_query_start
+            if elapsed < threshold or context.execution_options.get("slow_query_ignore"):
+                return
+            if executemany and parameters:
+                parameters = parameters[0]
+            self.record(engine, source, statement, parameters, elapsed)
+
+    def record(self, engine, source: str, statement: str, parameters, elapsed: float) -> None:
+        entry = SlowQuery(
+            statement=statement,
+            parameters=repr(parameters)[:MAX_PARAMS_CHARS],
+            duration_ms=elapsed * 1000,
+            source=source,
+            route=current_route.get(),
+            recorded_at=time.time(),
+        )
+        self.entries.append(entry)
+        self.recorded += 1
+        logger.warning(
+            "Slow query (%.1f ms, %s): %s",
+            entry.duration_ms,
+            entry.route or source,
+            " ".join(statement.split())[:200],
+        )
+        if self.settings.explain and self._should_explain(statement):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            task = loop.create_task(self._explain(engine, entry, statement, parameters))
+            self._explains.add(task)
+            task.add_done_callback(self._explains.discard)
+
+    def _should_explain(self, statement: str) -> bool:
+        if not statement.lstrip().lower().startswith(EXPLAINABLE):
+            return False
+        if len(self._explains) >= MAX_CONCURRENT_EXPLAINS:
+            return False
+        now = time.monotonic()
+        if now - self._explained_at.get(statement, float("-inf")) < EXPLAIN_COOLDOWN_SECONDS:
+            return False
+        if len(self._explained_at) >= self.settings.max_entries:
+            self._explained_at.clear()
+        self._explained_at[statement] = now
+        return True
+
+    async def _explain(self, engine, entry: SlowQuery, statement: str, parameters) -> None:
+        if engine.dialect.name == "postgresql":
+            explain = f"EXPLAIN (ANALYZE off) {statement}"
+        else:
+            explain = f"EXPLAIN QUERY PLAN {statement}"
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(slow_query_ignore=True)
+                result = await conn.exec_driver_sql(explain, parameters)
+                entry.plan = [
+                    " | ".join(str(value) for value in row) for row in result
+                ]
+                await conn.rollback()
+        except Exception as e:
+            entry.plan = [f"EXPLAIN failed: {e}"]
+
+    async def drain(self) -> None:
+        """Wait for pending EXPLAINs, e.g. before disposing a script's engine."""
+        if self._explains:
+            await asyncio.gather(*self._explains, return_exceptions=True)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def report(self) -> Dict:
+        return {
+            "enabled": self.settings.enabled,
+            "threshold_ms": self.settings.threshold_ms,
+            "recorded": self.recorded,
+            "entries": [asdict(entry) for entry in reversed(self.entries)],
+        }
+
+
+slow_query_log = SlowQueryLog(get_slow_query_settings())
@@ -1,9 +1,45 @@
+from contextlib import asynccontextmanager
+
 import app.models
-from app.routes import questions
+from app.db.session import engine
+from app.routes import admin, leaderboard, metrics, questions
 from app.routes.dependencies.auth import get_swagger_ui_oauth
-from fastapi import FastAPI
+from app.routes.dependencies.route_context import track_route
+from app.services.decks import question_decks
+from app.services.leaderboard import leaderboard as leaderboard_index
+from app.services.metrics import (
+    MetricsMiddleware,
+    get_metrics_settings,
+    instrument_engine,
+)
+from app.services.profiling import ProfilingMiddleware, request_profiler
+from app.services.question_bank import question_bank
+from app.services.question_stats import question_stats
+from app.services.ratings import ratings
+from app.services.scores import score_aggregator
+from fastapi import Depends, FastAPI
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await question_bank.start()
+    await question_decks.start()
+    await leaderboard_index.start()
+    await score_aggregator.start()
+    await ratings.start()
+    await question_stats.start()
+    yield
+    await question_stats.stop()
+    await ratings.stop()
+    await score_aggregator.stop()
+    await leaderboard_index.stop()
+    await question_decks.stop()
+    await question_bank.stop()
+
 
 app = FastAPI(
+    lifespan=lifespan,
+    dependencies=[Depends(track_route)],
     swagger_ui_init_oauth=get_swagger_ui_oauth(),
     swagger_ui_parameters={
         "persistAuthorization": True,
@@ -13,6 +49,17 @@ app = FastAPI(
 
 # app.include_router(docs.router)
 app.include_router(questions.router, prefix="/questions", tags=["questions"])
+app.include_router(leaderboard.router, prefix="/leaderboard", tags=["leaderboard"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+app.add_middleware(
+    ProfilingMiddleware, profiler=request_profiler, path_prefix="/questions"
+)
+
+if get_metrics_settings().enabled:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,3 +1,32 @@
-from .question import Answer, Base, Question, User
+from .question import (
+    INITIAL_RATING,
+    Answer,
+    Base,
+    Question,
+    User,
+    compute_content_hash,
+    initial_rating,
+    question_text_filter,
+)
+from .question_bank_version import BANK_VERSION_ID, QuestionBankVersion
+from .question_stat import QuestionStat
+from .seed_run import SeedRun
+from .spent_quiz import SpentQuiz
+from .user_deck import UserDeck
 
-__all__ = ["Question", "Answer", "User", "Base"]
+__all__ = [
+    "Question",
+    "Answer",
+    "User",
+    "SeedRun",
+    "SpentQuiz",
+    "QuestionStat",
+    "QuestionBankVersion",
+    "UserDeck",
+    "Base",
+    "compute_content_hash",
+    "initial_rating",
+    "question_text_filter",
+    "INITIAL_RATING",
+    "BANK_VERSION_ID",
+]
@@ -1,9 +1,15 @@
+import hashlib
+import json
+from typing import Iterable, Tuple
+
 from sqlalchemy import (
     TIMESTAMP,
     Boolean,
     CheckConstraint,
     Column,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -13,6 +19,38 @@ from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
+INITIAL_RATING = 1500.0
+LEVEL_RATING_STEP = 150.0
+DEFAULT_LEVEL = 10
+
+
+def initial_rating(level: int) -> float:
+    """Starting Elo rating of a new question, spread around 1500 by level."""
+    return INITIAL_RATING + (level - 11) * LEVEL_RATING_STEP
+
+
+def _default_rating(context) -> float:
+    # Inserts that do not set a rating, such as src/scripts/init_db.py, get
+    # the starting rating of the level they insert
+    level = context.get_current_parameters().get("level")
+    return initial_rating(level if level is not None else DEFAULT_LEVEL)
+
+
+def compute_content_hash(
+    question: str, level: int, answers: Iterable[Tuple[str, bool]]
+) -> str:
+    """
+    Stable SHA-256 of a question's text, level and (answer, correct) pairs.
+
+    Answers are sorted first, so the hash does not depend on their order.
+    """
+    canonical = json.dumps(
+        [question, level, sorted([answer, bool(correct)] for answer, correct in answers)],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
 
 class Question(Base):
     __tablename__ = "questions"
@@ -21,19 +59,49 @@ class Question(Base):
     question = Column(Text, nullable=False)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     answers = relationship("Answer", back_populates="question", cascade="all, delete")
-    level = Column(Integer, nullable=False, default=10)
+    level = Column(Integer, nullable=False, default=DEFAULT_LEVEL, index=True)
+    content_hash = Column(String(64))
+    rating = Column(
+        Float, nullable=False, default=_default_rating, server_default="1500", index=True
+    )
+    rating_attempts = Column(Integer, nullable=False, default=0, server_default="0")
 
     __table_args__ = (
         CheckConstraint("level IN (10, 11, 12)", name="check_valid_level"),
     )
 
 
+# Question text is too long for a btree key, so uniqueness is enforced on its
+# md5. Lookups must filter on md5(question) to use it; see question_text_filter.
+Index(
+    "uq_questions_question_md5", func.md5(Question.question), unique=True
+).ddl_if(dialect="postgresql")
+
+
+def question_text_filter(texts: Iterable[str], dialect_name: str):
+    """
+    WHERE clause matching questions by exact text.
+
+    On PostgreSQL the texts' md5 digests are matched first, so the lookup is an
+    index scan on ``uq_questions_question_md5`` instead of a sequential scan.
+    """
+    texts = list(texts)
+    condition = Question.question.in_(texts)
+    if dialect_name == "postgresql":
+        digests = [hashlib.md5(text.encode()).hexdigest() for text in texts]
+        condition = func.md5(Question.question).in_(digests) & condition
+    return condition
+
+
 class Answer(Base):
     __tablename__ = "answers"
 
     id = Column(Integer, primary_key=True)
     question_id = Column(
-        Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("questions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     answer = Column(Text, nullable=False)
     correct = Column(Boolean, nullable=False, default=False)
@@ -48,5 +116,6 @@ class User(Base):
     username = Column(String, unique=True, nullable=False)
     score = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
+    rating = Column(Float, nullable=False, default=INITIAL_RATING, server_default="1500")
+    rating_attempts = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
-    score = Column(Integer, default=0)
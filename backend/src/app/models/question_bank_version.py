@@ -0,0 +1,17 @@
+from sqlalchemy import TIMESTAMP, BigInteger, Column, Integer, func
+
+from .question import Base
+
+BANK_VERSION_ID = 1
+
+
+class QuestionBankVersion(Base):
+    """Single-row counter that seeds/seed.py bumps whenever it changes the bank."""
+
+    __tablename__ = "question_bank_version"
+
+    id = Column(Integer, primary_key=True, default=BANK_VERSION_ID)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+
+from .question import Base
+
+
+class QuestionStat(Base):
+    """How many times an answer was picked for a question, per response-time bucket."""
+
+    __tablename__ = "question_stats"
+
+    question_id = Column(
+        Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True
+    )
+    # 0 when the question was left unanswered. Not a foreign key: seeding
+    # replaces a changed question's answers, and old counts are kept.
+    answer_id = Column(Integer, primary_key=True)
+    # 0 when no response time was reported; see app.services.question_stats
+    time_bucket = Column(Integer, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,17 @@
+from sqlalchemy import TIMESTAMP, Boolean, Column, Integer, String, Text, func
+
+from .question import Base
+
+
+class SeedRun(Base):
+    __tablename__ = "seed_runs"
+
+    id = Column(Integer, primary_key=True)
+    path = Column(Text, unique=True, nullable=False)
+    checksum = Column(String(64), nullable=False)
+    changes = Column(Integer, nullable=False, default=0)
+    # The run only added new questions; existing ones were not compared
+    skip_existing = Column(Boolean, nullable=False, default=False, server_default="false")
+    applied_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
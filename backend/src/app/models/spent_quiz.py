@@ -0,0 +1,15 @@
+from sqlalchemy import TIMESTAMP, Column, LargeBinary, String
+
+from .question import Base
+
+
+class SpentQuiz(Base):
+    """A graded quiz token, so that no replica grades it again."""
+
+    __tablename__ = "spent_quizzes"
+
+    # SHA-256 of the token
+    token_hash = Column(LargeBinary, primary_key=True)
+    username = Column(String, nullable=False)
+    # After this the token no longer verifies and the row can be deleted
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False, index=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import TIMESTAMP, Column, Integer, LargeBinary, String, func
+
+from .question import Base
+
+
+class UserDeck(Base):
+    __tablename__ = "user_decks"
+
+    username = Column(String, primary_key=True)
+    # 0 for the deck that draws from every level
+    level = Column(Integer, primary_key=True)
+    # Shuffled question ids as little-endian uint32s
+    question_ids = Column(LargeBinary, nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
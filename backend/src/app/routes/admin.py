@@ -0,0 +1,119 @@
+from typing import Dict
+
+from app.db.session import get_db, get_pool_stats
+from app.db.slow_queries import slow_query_log
+from app.routes.dependencies.auth import (
+    get_auth0_config,
+    get_jwks_store,
+    get_token_cache,
+    get_token_validator,
+)
+from app.services.bank_reads import bank_reads
+from app.services.decks import question_decks
+from app.services.leaderboard import leaderboard
+from app.services.profiling import request_profiler
+from app.services.question_bank import question_bank
+from app.services.question_stats import (
+    fetch_question_accuracy,
+    fetch_question_stats,
+    question_stats,
+)
+from app.services.ratings import ratings
+from app.services.scores import score_aggregator
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+token_validator = get_token_validator()
+
+
+async def require_admin(claims: Dict = Depends(token_validator)) -> Dict:
+    permission = get_auth0_config().admin_permission
+    if permission not in claims.get("permissions", []):
+        raise HTTPException(status_code=403, detail="Admin permission required")
+    return claims
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/question-bank")
+async def get_question_bank_stats():
+    return question_bank.stats()
+
+
+@router.get("/bank-reads")
+async def get_bank_read_stats():
+    return bank_reads.stats()
+
+
+@router.get("/decks")
+async def get_deck_stats():
+    return question_decks.stats()
+
+
+@router.get("/scores")
+async def get_score_stats():
+    return score_aggregator.stats()
+
+
+@router.get("/leaderboard")
+async def get_leaderboard_stats():
+    return leaderboard.stats()
+
+
+@router.get("/ratings")
+async def get_rating_stats():
+    return ratings.stats()
+
+
+@router.get("/question-stats")
+async def get_question_accuracy(
+    min_attempts: int = Query(20, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    """Questions with enough attempts, least accurate first, as candidates to retire."""
+    return {
+        "recorder": question_stats.stats(),
+        "questions": await fetch_question_accuracy(db, min_attempts, limit),
+    }
+
+
+@router.get("/question-stats/{question_id}")
+async def get_question_stats(question_id: int, db: AsyncSession = Depends(get_db)):
+    stats = await fetch_question_stats(db, question_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No statistics for this question")
+    return stats
+
+
+@router.get("/auth")
+async def get_auth_stats():
+    return {"jwks": get_jwks_store().stats(), "token_cache": get_token_cache().stats()}
+
+
+@router.get("/database")
+async def get_database_stats():
+    return get_pool_stats()
+
+
+@router.get("/slow-queries")
+async def get_slow_queries():
+    return slow_query_log.report()
+
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries():
+    slow_query_log.clear()
+
+
+@router.get("/profiling")
+async def get_profiling():
+    return request_profiler.stats()
+
+
+@router.put("/profiling")
+async def set_profiling_rate(sample_rate: float = Query(..., ge=0.0, le=1.0)):
+    """Profile this fraction of /questions requests until changed again (per process)."""
+    request_profiler.sample_rate = sample_rate
+    return request_profiler.stats()
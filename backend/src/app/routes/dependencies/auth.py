@@ -1,7 +1,9 @@
-import os
-from typing import Any, Dict, List, Tuple
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-import requests
+from app.routes.dependencies.jwks import JWKSKeyStore, get_unverified_kid
+from app.routes.dependencies.token_cache import VerifiedTokenCache
+from app.services.metrics import auth_duration
 from authlib.jose import JsonWebToken
 from authlib.jose.errors import BadSignatureError, ExpiredTokenError, JoseError
 from dotenv import load_dotenv
@@ -18,6 +20,10 @@ class AuthSettings(BaseSettings):
     audience: str = Field(..., alias="SWAGGER_API_AUDIENCE")
     client_id: str = Field(..., alias="SWAGGER_CLIENT_ID")
     algorithms: List[str] = Field(default=["RS256"])
+    admin_permission: str = Field(default="admin", alias="AUTH_ADMIN_PERMISSION")
+    jwks_url: Optional[str] = Field(default=None, alias="AUTH_JWKS_URL")
+    jwks_ttl_seconds: float = Field(default=600.0, alias="AUTH_JWKS_TTL_SECONDS")
+    token_cache_size: int = Field(default=10_000, alias="AUTH_TOKEN_CACHE_SIZE")
 
     class config:
         extra = "ignore"
@@ -28,6 +34,29 @@ def get_auth0_config() -> AuthSettings:
     return auth_settings
 
 
+_jwks_store: Optional[JWKSKeyStore] = None
+_token_cache: Optional[VerifiedTokenCache] = None
+
+
+def get_jwks_store() -> JWKSKeyStore:
+    global _jwks_store
+    if _jwks_store is None:
+        auth0_config = get_auth0_config()
+        jwks_url = (
+            auth0_config.jwks_url
+            or f"https://{auth0_config.domain}/.well-known/jwks.json"
+        )
+        _jwks_store = JWKSKeyStore(jwks_url, ttl_seconds=auth0_config.jwks_ttl_seconds)
+    return _jwks_store
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache(get_auth0_config().token_cache_size)
+    return _token_cache
+
+
 def get_swagger_auth_components() -> Tuple[OAuth2AuthorizationCodeBearer, JsonWebToken]:
     auth0_config = get_auth0_config()
 
@@ -51,16 +80,24 @@ def get_swagger_ui_oauth() -> Dict[str, Any]:
 
 def get_token_validator():
     oauth2_scheme, jwt_instance = get_swagger_auth_components()
+    jwks_store = get_jwks_store()
+    token_cache = get_token_cache()
 
     async def validate_swagger_token(token: str = Depends(oauth2_scheme)) -> Dict:
+        start = time.perf_counter()
+        cached_claims = token_cache.get(token)
+        if cached_claims is not None:
+            auth_duration.observe(time.perf_counter() - start, "cached")
+            return cached_claims
+
         auth0_config = get_auth0_config()
+        outcome = "rejected"
         try:
-            jwks_url = f"https://{auth0_config.domain}/.well-known/jwks.json"
-            jwks = requests.get(jwks_url).json()
+            key = await jwks_store.get_key(get_unverified_kid(token))
 
             claims = jwt_instance.decode(
                 token,
-                key=jwks,
+                key=key,
                 claims_options={
                     "aud": {"essential": True, "value": auth0_config.audience},
                     "iss": {
@@ -70,6 +107,8 @@ def get_token_validator():
                 },
             )
             claims.validate()
+            token_cache.put(token, claims)
+            outcome = "verified"
             return claims
 
         except ExpiredTokenError as e:
@@ -92,4 +131,7 @@ def get_token_validator():
                 f"Unexpected error during swagger token validation: {str(e)}"
             )
 
+        finally:
+            auth_duration.observe(time.perf_counter() - start, outcome)
+
     return validate_swagger_token
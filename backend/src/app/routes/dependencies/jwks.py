@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+import requests
+from authlib.jose import JsonWebKey
+from authlib.jose.errors import JoseError
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownKeyError(JoseError):
+    error = "unknown_key"
+
+
+def get_unverified_kid(token: str) -> Optional[str]:
+    """Read the ``kid`` from a JWT header without verifying the token."""
+    try:
+        header_segment = token.split(".", 1)[0]
+        padded = header_segment + "=" * (-len(header_segment) % 4)
+        header = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as e:
+        raise JoseError(f"Malformed token header: {e}")
+    if not isinstance(header, dict):
+        raise JoseError("Malformed token header")
+    return header.get("kid")
+
+
+class JWKSKeyStore:
+    """
+    Async cache of the issuer's signing keys, keyed by ``kid``.
+
+    Keys are served from memory until ``ttl_seconds`` after the last fetch. A
+    lookup inside the final ``refresh_ahead_seconds`` of that window kicks off
+    a background refresh, and a lookup for an unknown ``kid`` forces one
+    refetch (at most every ``min_refetch_seconds``) to pick up key rotation.
+    Concurrent fetches are coalesced into a single HTTP request, which runs in
+    a worker thread so the event loop is never blocked.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: float = 600.0,
+        refresh_ahead_seconds: float = 60.0,
+        min_refetch_seconds: float = 30.0,
+        timeout_seconds: float = 5.0,
+    ):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self.timeout_seconds = timeout_seconds
+        self._keys: Dict[Optional[str], object] = {}
+        self._fetched_at: Optional[float] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self.fetches = 0
+        self.fetch_failures = 0
+
+    def _is_fresh(self, now: float) -> bool:
+        return self._fetched_at is not None and now - self._fetched_at < self.ttl_seconds
+
+    async def get_key(self, kid: Optional[str]):
+        now = time.monotonic()
+        if self._is_fresh(now):
+            if now - self._fetched_at >= self.ttl_seconds - self.refresh_ahead_seconds:
+                self._start_fetch()
+            key = self._lookup(kid)
+            if key is not None:
+                return key
+            if now - self._fetched_at < self.min_refetch_seconds:
+                raise UnknownKeyError(f"No signing key found for kid '{kid}'")
+
+        try:
+            await self.refresh()
+        except Exception:
+            # Keep serving the keys we already have if the issuer is unreachable.
+            if not self._keys:
+                raise
+            logger.exception("JWKS refresh failed; serving cached keys")
+
+        key = self._lookup(kid)
+        if key is None:
+            raise UnknownKeyError(f"No signing key found for kid '{kid}'")
+        return key
+
+    def _lookup(self, kid: Optional[str]):
+        if kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        return self._keys.get(kid)
+
+    async def refresh(self) -> None:
+        await asyncio.shield(self._start_fetch())
+
+    def _start_fetch(self) -> asyncio.Future:
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._fetch())
+            self._inflight.add_done_callback(self._log_failure)
+        return self._inflight
+
+    @staticmethod
+    def _log_failure(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("JWKS fetch failed: %s", task.exception())
+
+    async def _fetch(self) -> None:
+        try:
+            self.fetches += 1
+            response = await asyncio.to_thread(
+                requests.get, self.url, timeout=self.timeout_seconds
+            )
+            response.raise_for_status()
+            key_set = JsonWebKey.import_key_set(response.json())
+            self._keys = {key.kid: key for key in key_set.keys}
+            self._fetched_at = time.monotonic()
+        except Exception:
+            self.fetch_failures += 1
+            raise
+        finally:
+            self._inflight = None
+
+    def stats(self) -> Dict:
+        return {
+            "keys": len(self._keys),
+            "fetches": self.fetches,
+            "fetch_failures": self.fetch_failures,
+            "age_seconds": (
+                time.monotonic() - self._fetched_at if self._fetched_at else None
+            ),
+        }
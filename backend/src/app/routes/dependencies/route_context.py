@@ -0,0 +1,8 @@
+from app.db.slow_queries import current_route
+from fastapi import Request
+
+
+async def track_route(request: Request) -> None:
+    """Remember the matched route template for logs written while serving the request."""
+    route = request.scope.get("route")
+    current_route.set(getattr(route, "path", request.url.path))
@@ -0,0 +1,56 @@
+from typing import Dict
+
+from app.db.session import get_db
+from app.routes.dependencies.auth import get_token_validator
+from app.schemas import LeaderboardPage, LeaderboardStanding
+from app.services.leaderboard import fetch_standing, fetch_top, leaderboard
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PAGE_SIZE = 100
+MAX_NEIGHBORS = 25
+
+token_validator = get_token_validator()
+router = APIRouter(dependencies=[Depends(token_validator)])
+
+
+@router.get("", response_model=LeaderboardPage)
+async def get_leaderboard(
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """Top scores, highest first. Tied users share a rank."""
+    if leaderboard.ready:
+        return leaderboard.top(limit, offset)
+    return await fetch_top(db, limit, offset)
+
+
+async def _standing(db: AsyncSession, username: str, neighbors: int) -> Dict:
+    if leaderboard.ready:
+        standing = leaderboard.standing(username, neighbors)
+    else:
+        standing = await fetch_standing(db, username, neighbors)
+    if standing is None:
+        raise HTTPException(status_code=404, detail="User has no score yet")
+    return standing
+
+
+@router.get("/me", response_model=LeaderboardStanding)
+async def get_my_standing(
+    neighbors: int = Query(2, ge=0, le=MAX_NEIGHBORS),
+    claims: Dict = Depends(token_validator),
+    db: AsyncSession = Depends(get_db),
+):
+    """The caller's rank and the users just above and below them."""
+    return await _standing(db, claims["sub"], neighbors)
+
+
+@router.get("/users/{username}", response_model=LeaderboardStanding)
+async def get_user_standing(
+    username: str,
+    neighbors: int = Query(2, ge=0, le=MAX_NEIGHBORS),
+    db: AsyncSession = Depends(get_db),
+):
+    """A user's rank and the users just above and below them."""
+    return await _standing(db, username, neighbors)
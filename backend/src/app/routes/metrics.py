@@ -0,0 +1,118 @@
+from app.db.session import get_pool_stats
+from app.routes.dependencies.auth import get_jwks_store, get_token_cache
+from app.services.metrics import registry
+from app.services.question_bank import question_bank
+from app.services.scores import score_aggregator
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter()
+
+
+def collect_component_stats():
+    """Expose the cache and pool counters the services already keep."""
+    bank = question_bank.stats()
+    yield (
+        "question_bank_lookups_total",
+        "counter",
+        "Question bank cache lookups by result",
+        [({"result": "hit"}, bank["hits"]), ({"result": "miss"}, bank["misses"])],
+    )
+    yield (
+        "question_bank_questions",
+        "gauge",
+        "Questions in the cached snapshot",
+        [({}, bank["questions"])],
+    )
+
+    token_cache = get_token_cache().stats()
+    yield (
+        "auth_token_cache_lookups_total",
+        "counter",
+        "Verified token cache lookups by result",
+        [
+            ({"result": "hit"}, token_cache["hits"]),
+            ({"result": "miss"}, token_cache["misses"]),
+        ],
+    )
+    yield (
+        "auth_token_cache_entries",
+        "gauge",
+        "Tokens in the verified token cache",
+        [({}, token_cache["entries"])],
+    )
+
+    jwks = get_jwks_store().stats()
+    yield (
+        "auth_jwks_fetches_total",
+        "counter",
+        "JWKS fetches by result",
+        [
+            ({"result": "ok"}, jwks["fetches"] - jwks["fetch_failures"]),
+            ({"result": "error"}, jwks["fetch_failures"]),
+        ],
+    )
+
+    scores = score_aggregator.stats()
+    yield (
+        "score_pending_users",
+        "gauge",
+        "Users with score updates waiting to be written",
+        [({}, scores["pending_users"])],
+    )
+    yield (
+        "score_pending_oldest_seconds",
+        "gauge",
+        "Age of the oldest score update waiting to be written",
+        [({}, scores["oldest_pending_seconds"])],
+    )
+    yield (
+        "score_flushes_total",
+        "counter",
+        "Batched score writes by result",
+        [
+            ({"result": "ok"}, scores["flushes"]),
+            ({"result": "error"}, scores["flush_failures"]),
+        ],
+    )
+
+    pool = get_pool_stats()
+    if "checked_out" in pool:
+        yield (
+            "db_pool_connections",
+            "gauge",
+            "Database pool connections by state",
+            [
+                ({"state": "checked_out"}, pool["checked_out"]),
+                ({"state": "idle"}, pool["checked_in"]),
+                ({"state": "overflow"}, pool["overflow"]),
+            ],
+        )
+        yield (
+            "db_pool_checkout_wait_seconds_total",
+            "counter",
+            "Total time spent waiting for a pooled connection",
+            [({}, pool["total_wait_seconds"])],
+        )
+        yield (
+            "db_pool_checkouts_total",
+            "counter",
+            "Connections checked out of the pool",
+            [({}, pool["checkouts"])],
+        )
+        yield (
+            "db_pool_timeouts_total",
+            "counter",
+            "Checkouts that timed out waiting for a connection",
+            [({}, pool["timeouts"])],
+        )
+
+
+registry.add_collector(collect_component_stats)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
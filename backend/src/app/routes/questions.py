@@ -1,9 +1,33 @@
 import random
+from typing import Dict, Optional
 
 from app.db.session import get_db
 from app.models import Answer, Question
 from app.routes.dependencies.auth import get_token_validator
-from fastapi import APIRouter, Depends, HTTPException
+from app.schemas import QuizResult, QuizSubmission
+from app.services.bank_reads import (
+    bank_reads,
+    export_bank,
+    question_by_id,
+    questions_by_level,
+)
+from app.services.decks import question_decks
+from app.services.grading import GradingError, grade_answers, load_answer_key
+from app.services.leaderboard import leaderboard
+from app.services.question_bank import question_bank
+from app.services.question_stats import question_stats
+from app.services.quiz import (
+    MAX_QUIZ_SIZE,
+    VALID_LEVELS,
+    build_adaptive_quiz,
+    build_quiz,
+    parse_level_mix,
+)
+from app.services.quiz_token import InvalidQuizToken, quiz_tokens, spent_key
+from app.services.ratings import ratings
+from app.services.sampling import sample_question_ids
+from app.services.scores import GradedQuiz, record_quiz_scores, score_aggregator
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -12,14 +36,30 @@ router = APIRouter(dependencies=[Depends(token_validator)])
 
 
 @router.get("/random")
-async def get_random_question(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Question))
-    questions = result.scalars().all()
+async def get_random_question(
+    claims: Dict = Depends(token_validator), db: AsyncSession = Depends(get_db)
+):
+    snapshot = question_bank.snapshot()
+    if snapshot is not None:
+        drawn = await question_decks.draw(claims["sub"], snapshot, 1)
+        if not drawn:
+            raise HTTPException(status_code=404, detail="No questions found")
 
-    if not questions:
+        question = drawn[0]
+        return {
+            "id": question.id,
+            "question": question.question,
+            "answers": [
+                {"id": a.id, "answer": a.answer, "correct": a.correct}
+                for a in question.shuffled_answers()
+            ],
+        }
+
+    question_ids = await sample_question_ids(db, 1)
+    if not question_ids:
         raise HTTPException(status_code=404, detail="No questions found")
 
-    question = random.choice(questions)
+    question = await db.get(Question, question_ids[0])
 
     result = await db.execute(select(Answer).where(Answer.question_id == question.id))
     answers = result.scalars().all()
@@ -35,28 +75,151 @@ async def get_random_question(db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/ten")
-async def get_random_question(db: AsyncSession = Depends(get_db)):
+async def get_ten_questions(
+    claims: Dict = Depends(token_validator), db: AsyncSession = Depends(get_db)
+):
     """Get 10 questions with their answers."""
-    result = await db.execute(select(Question))
-    questions = result.scalars().all()
+    questions_with_answers = await build_quiz(db, {None: 10}, claims["sub"])
+    if not questions_with_answers:
+        raise HTTPException(status_code=404, detail="No questions found")
+    return questions_with_answers
 
-    if not questions:
+
+@router.get("/quiz")
+async def get_quiz(
+    claims: Dict = Depends(token_validator),
+    n: int = Query(10, ge=1, le=MAX_QUIZ_SIZE),
+    level: Optional[int] = Query(None),
+    mix: Optional[str] = Query(
+        None, description="Per-level counts such as 10:4,11:3,12:3; overrides n and level"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a quiz of n questions, optionally restricted to a level or a level mix."""
+    if mix is not None:
+        try:
+            counts = parse_level_mix(mix)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    elif level is not None:
+        if level not in VALID_LEVELS:
+            raise HTTPException(status_code=400, detail=f"Invalid level {level}")
+        counts = {level: n}
+    else:
+        counts = {None: n}
+
+    questions_with_answers = await build_quiz(db, counts, claims["sub"])
+    if not questions_with_answers:
         raise HTTPException(status_code=404, detail="No questions found")
 
-    selected_questions = random.sample(questions, min(10, len(questions)))
-    questions_with_answers = []
-    for question in selected_questions:
-        result = await db.execute(
-            select(Answer).where(Answer.question_id == question.id)
-        )
-        answers = result.scalars().all()
-        random.shuffle(answers)
-
-        questions_with_answers.append(
-            {
-                "id": question.id,
-                "question": question.question,
-                "answers": [{"id": a.id, "answer": a.answer} for a in answers],
-            }
-        )
-    return questions_with_answers
+    quiz_id = quiz_tokens.issue(
+        claims["sub"],
+        [q["id"] for q in questions_with_answers],
+        [[a["id"] for a in q["answers"]] for q in questions_with_answers],
+    )
+    return {"id": quiz_id, "questions": questions_with_answers}
+
+
+@router.get("/adaptive")
+async def get_adaptive_quiz(
+    claims: Dict = Depends(token_validator),
+    n: int = Query(10, ge=1, le=MAX_QUIZ_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a quiz of n questions whose difficulty rating is close to the user's rating."""
+    rating, _ = await ratings.user_rating(claims["sub"])
+    questions_with_answers = await build_adaptive_quiz(db, rating, n)
+    if not questions_with_answers:
+        raise HTTPException(status_code=404, detail="No questions found")
+
+    quiz_id = quiz_tokens.issue(
+        claims["sub"],
+        [q["id"] for q in questions_with_answers],
+        [[a["id"] for a in q["answers"]] for q in questions_with_answers],
+    )
+    return {"id": quiz_id, "rating": rating, "questions": questions_with_answers}
+
+
+@router.post("/quiz/{quiz_id}/submit", response_model=QuizResult)
+async def submit_quiz(
+    quiz_id: str,
+    submission: QuizSubmission,
+    claims: Dict = Depends(token_validator),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Grade a whole quiz in one request, add the points to the user's score and
+    update the user's and the questions' ratings.
+    """
+    try:
+        quiz = quiz_tokens.verify(quiz_id, claims["sub"])
+    except InvalidQuizToken as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if quiz_tokens.is_spent(quiz_id):
+        raise HTTPException(status_code=409, detail="Quiz was already submitted")
+
+    answer_key = await load_answer_key(db, quiz.question_ids)
+    try:
+        results = grade_answers(quiz, answer_key, submission.answers)
+    except GradingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    score = sum(1 for r in results if r.correct)
+    graded = GradedQuiz(claims["sub"], score, quiz_tokens.expires_at(quiz))
+    if score_aggregator.enabled:
+        recorded = score_aggregator.add(spent_key(quiz_id), graded)
+    else:
+        deltas, _ = await record_quiz_scores(db, {spent_key(quiz_id): graded})
+        recorded = claims["sub"] in deltas
+        if recorded:
+            async with leaderboard.lock:
+                await db.commit()
+                leaderboard.apply(deltas)
+    if not recorded:
+        raise HTTPException(status_code=409, detail="Quiz was already submitted")
+    # Only once the points are recorded, so a failed write can be resubmitted
+    quiz_tokens.mark_spent(quiz_id, quiz)
+
+    await ratings.record(claims["sub"], results)
+    question_stats.record(
+        results,
+        {a.question_id: a.elapsed_ms for a in submission.answers if a.elapsed_ms is not None},
+    )
+
+    return QuizResult(quiz_id=quiz_id, score=score, total=len(results), results=results)
+
+
+@router.get("/export")
+async def export_questions(request: Request, db: AsyncSession = Depends(get_db)):
+    """Every question with its answers (without correct flags), in id order."""
+    return await bank_reads.respond(request, db, "export", export_bank)
+
+
+@router.get("/levels/{level}")
+async def list_level(
+    request: Request,
+    level: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """A page of the questions at a level (without correct flags), in id order."""
+    if level not in VALID_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Invalid level {level}")
+    return await bank_reads.respond(
+        request,
+        db,
+        f"level:{level}:{offset}:{limit}",
+        questions_by_level(level, offset, limit),
+    )
+
+
+# Declared last so that the fixed paths above take precedence
+@router.get("/{question_id}")
+async def get_question(
+    request: Request, question_id: int, db: AsyncSession = Depends(get_db)
+):
+    """One question with its answers (without correct flags)."""
+    return await bank_reads.respond(
+        request, db, f"question:{question_id}", question_by_id(question_id)
+    )
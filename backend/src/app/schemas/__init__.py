@@ -0,0 +1,12 @@
+from .leaderboard import LeaderboardEntry, LeaderboardPage, LeaderboardStanding
+from .quiz import QuestionResult, QuizResult, QuizSubmission, SubmittedAnswer
+
+__all__ = [
+    "SubmittedAnswer",
+    "QuizSubmission",
+    "QuestionResult",
+    "QuizResult",
+    "LeaderboardEntry",
+    "LeaderboardPage",
+    "LeaderboardStanding",
+]
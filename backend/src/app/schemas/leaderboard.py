@@ -0,0 +1,20 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    username: str
+    score: int
+
+
+class LeaderboardPage(BaseModel):
+    total: int
+    entries: List[LeaderboardEntry]
+
+
+class LeaderboardStanding(BaseModel):
+    total: int
+    user: LeaderboardEntry
+    neighbors: List[LeaderboardEntry]
@@ -0,0 +1,28 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SubmittedAnswer(BaseModel):
+    question_id: int
+    answer_id: int
+    # Time the student spent on the question, for question statistics
+    elapsed_ms: Optional[int] = Field(default=None, ge=0)
+
+
+class QuizSubmission(BaseModel):
+    answers: List[SubmittedAnswer] = Field(default_factory=list)
+
+
+class QuestionResult(BaseModel):
+    question_id: int
+    answer_id: Optional[int]
+    correct: bool
+    correct_answer_id: int
+
+
+class QuizResult(BaseModel):
+    quiz_id: str
+    score: int
+    total: int
+    results: List[QuestionResult]
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs ``job`` in a background task every ``interval`` seconds, or as soon
+    as ``wake()`` is called.
+
+    ``stop()`` never cancels a run in progress: it tells the loop to exit,
+    waits for the current run to finish and then, with ``run_on_stop``, runs
+    the job once more. A job that takes work out of a buffer before writing
+    it therefore always gets to write it or put it back. Failures are logged
+    and counted, and the loop carries on.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[object]],
+        interval: float,
+        run_on_stop: bool = False,
+    ):
+        self.name = name
+        self._job = job
+        self.interval = interval
+        self.run_on_stop = run_on_stop
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self.failures = 0
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def run(self) -> bool:
+        """Run the job now. Returns False, after logging the error, if it failed."""
+        try:
+            await self._job()
+        except Exception:
+            self.failures += 1
+            logger.exception("%s failed", self.name)
+            return False
+        return True
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._stopping:
+                return
+            await self.run()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            # Shielded so that cancelling shutdown does not cancel a run midway
+            await asyncio.shield(self._task)
+            self._task = None
+        if self.run_on_stop:
+            await self.run()
@@ -0,0 +1,186 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.models import BANK_VERSION_ID, Question, QuestionBankVersion
+from app.services.question_bank import QuestionBankSnapshot, question_bank
+from app.services.quiz import serialize_question
+from fastapi import HTTPException, Request, Response
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+# Builds the JSON-ready body from the snapshot when the cache is warm, or from
+# the database; returns None when the resource does not exist
+Builder = Callable[[Optional[QuestionBankSnapshot], AsyncSession], Awaitable[Optional[object]]]
+
+
+class BankReadSettings(BaseSettings):
+    cache_control: str = Field(default="private, max-age=60", alias="BANK_CACHE_CONTROL")
+    max_bodies: int = Field(default=256, alias="BANK_RESPONSE_CACHE_SIZE")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_bank_read_settings() -> BankReadSettings:
+    return BankReadSettings()
+
+
+def etag_for(bank_version: int, key: str) -> str:
+    """Strong validator: identical for a resource as long as the bank version is."""
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return f'"{bank_version}-{digest}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in header.split(",")
+    )
+
+
+class BankReadCache:
+    """
+    Serves deterministic reads of the question bank with ETags.
+
+    The ETag of a resource is derived from the ``question_bank_version``
+    counter, taken from the cached snapshot when it is warm, so a matching
+    ``If-None-Match`` gets a 304 without a database query. Encoded bodies are
+    kept per version in a small LRU, so repeat reads that do reach the API are
+    not serialized again; they are dropped when the version changes.
+    """
+
+    def __init__(self, settings: BankReadSettings):
+        self.settings = settings
+        self._bank_version: Optional[int] = None
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self.not_modified = 0
+        self.body_hits = 0
+        self.body_misses = 0
+
+    async def respond(
+        self, request: Request, db: AsyncSession, key: str, build: Builder
+    ) -> Response:
+        snapshot = question_bank.snapshot()
+        if snapshot is not None:
+            bank_version = snapshot.bank_version
+        else:
+            bank_version = await fetch_bank_version(db)
+
+        etag = etag_for(bank_version, key)
+        headers = {"ETag": etag, "Cache-Control": self.settings.cache_control}
+        if if_none_match(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        if bank_version != self._bank_version:
+            self._bodies.clear()
+            self._bank_version = bank_version
+        body = self._bodies.get(key)
+        if body is not None:
+            self.body_hits += 1
+            self._bodies.move_to_end(key)
+        else:
+            self.body_misses += 1
+            data = await build(snapshot, db)
+            if data is None:
+                raise HTTPException(status_code=404, detail="Not found")
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+            self._bodies[key] = body
+            while len(self._bodies) > self.settings.max_bodies:
+                self._bodies.popitem(last=False)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict:
+        return {
+            "bank_version": self._bank_version,
+            "cache_control": self.settings.cache_control,
+            "cached_bodies": len(self._bodies),
+            "cached_bytes": sum(len(body) for body in self._bodies.values()),
+            "not_modified": self.not_modified,
+            "body_hits": self.body_hits,
+            "body_misses": self.body_misses,
+        }
+
+
+async def fetch_bank_version(db: AsyncSession) -> int:
+    version = await db.scalar(
+        select(QuestionBankVersion.version).where(
+            QuestionBankVersion.id == BANK_VERSION_ID
+        )
+    )
+    return version or 0
+
+
+def _serialize(question, answers) -> Dict:
+    # Answers in id order and without correct flags, so bodies are stable
+    return serialize_question(question, sorted(answers, key=lambda a: a.id))
+
+
+async def _load_questions(db: AsyncSession, *conditions) -> List[Question]:
+    result = await db.execute(
+        select(Question)
+        .where(*conditions)
+        .options(selectinload(Question.answers))
+        .order_by(Question.id)
+    )
+    return list(result.scalars())
+
+
+def question_by_id(question_id: int) -> Builder:
+    async def build(snapshot, db):
+        if snapshot is not None:
+            question = snapshot.questions.get(question_id)
+            return _serialize(question, question.answers) if question else None
+        questions = await _load_questions(db, Question.id == question_id)
+        return _serialize(questions[0], questions[0].answers) if questions else None
+
+    return build
+
+
+def questions_by_level(level: int, offset: int, limit: int) -> Builder:
+    async def build(snapshot, db):
+        if snapshot is not None:
+            ids = snapshot.pool(level)[offset : offset + limit]
+            questions = [snapshot.questions[i] for i in ids]
+            total = len(snapshot.pool(level))
+        else:
+            result = await db.execute(
+                select(Question.id)
+                .where(Question.level == level)
+                .order_by(Question.id)
+                .offset(offset)
+                .limit(limit)
+            )
+            ids = list(result.scalars())
+            questions = await _load_questions(db, Question.id.in_(ids)) if ids else []
+            total = await db.scalar(
+                select(func.count(Question.id)).where(Question.level == level)
+            )
+        return {
+            "level": level,
+            "total": total,
+            "offset": offset,
+            "questions": [_serialize(q, q.answers) for q in questions],
+        }
+
+    return build
+
+
+async def export_bank(snapshot, db) -> Dict:
+    if snapshot is not None:
+        questions: List = [snapshot.questions[i] for i in snapshot.ids]
+    else:
+        questions = await _load_questions(db)
+    return {"questions": [_serialize(q, q.answers) for q in questions]}
+
+
+bank_reads = BankReadCache(get_bank_read_settings())
@@ -0,0 +1,271 @@
+import random
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.db.session import AsyncSessionLocal
+from app.models import UserDeck
+from app.services.background import PeriodicTask
+from app.services.question_bank import CachedQuestion, QuestionBankSnapshot
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+ALL_LEVELS = 0
+FLUSH_CHUNK_SIZE = 500
+
+
+class DeckSettings(BaseSettings):
+    enabled: bool = Field(default=True, alias="QUESTION_DECKS_ENABLED")
+    max_decks: int = Field(default=2_000, alias="QUESTION_DECKS_MAX")
+    persist: bool = Field(default=False, alias="QUESTION_DECKS_PERSIST")
+    flush_seconds: float = Field(default=30.0, alias="QUESTION_DECKS_FLUSH_SECONDS")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_deck_settings() -> DeckSettings:
+    return DeckSettings()
+
+
+def _pack(ids: array) -> bytes:
+    if sys.byteorder == "little":
+        return ids.tobytes()
+    swapped = array("I", ids)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _unpack(data: bytes) -> array:
+    ids = array("I")
+    ids.frombytes(data)
+    if sys.byteorder != "little":
+        ids.byteswap()
+    return ids
+
+
+class Deck:
+    """
+    A shuffled permutation of a question pool and a cursor into it.
+
+    Ids before ``position`` have been drawn in the current pass. Drawing
+    advances the cursor; once it reaches the end, the ids are reshuffled in
+    place and a new pass starts.
+    """
+
+    __slots__ = ("ids", "position", "version", "ids_changed")
+
+    def __init__(self, ids: array, position: int = 0, version: Optional[int] = None):
+        self.ids = ids
+        self.position = position
+        self.version = version
+        self.ids_changed = True
+
+    @classmethod
+    def shuffled(cls, pool: Iterable[int], version: int) -> "Deck":
+        ids = array("I", pool)
+        random.shuffle(ids)
+        return cls(ids, 0, version)
+
+    def rebase(self, pool: Tuple[int, ...], version: int) -> None:
+        """
+        Adapt the deck to a changed bank: drop removed questions and mix new
+        ones in with the questions not drawn yet in this pass.
+        """
+        in_pool = set(pool)
+        in_deck = set(self.ids)
+        seen = [i for i in self.ids[: self.position] if i in in_pool]
+        remaining = [i for i in self.ids[self.position :] if i in in_pool]
+        remaining.extend(i for i in pool if i not in in_deck)
+        random.shuffle(remaining)
+        self.ids = array("I", seen + remaining)
+        self.position = len(seen)
+        self.version = version
+        self.ids_changed = True
+
+    def draw(self, k: int) -> list[int]:
+        """Draw ``k`` distinct ids; amortized O(1) per id."""
+        k = min(k, len(self.ids))
+        drawn: list[int] = []
+        while len(drawn) < k:
+            if self.position >= len(self.ids):
+                random.shuffle(self.ids)
+                self.position = 0
+                self.ids_changed = True
+            question_id = self.ids[self.position]
+            self.position += 1
+            # Only possible right after a reshuffle within this draw
+            if question_id not in drawn:
+                drawn.append(question_id)
+        return drawn
+
+
+class QuestionDecks:
+    """
+    Per-user, per-level decks so students see every question before any repeats.
+
+    Decks are built from the question bank cache and kept in an LRU bounded by
+    ``max_decks``; each deck costs 4 bytes per question in its pool. With
+    ``persist`` on, changed decks are written to ``user_decks`` in batches
+    every ``flush_seconds`` (and on shutdown), and a user's deck is loaded
+    from there the first time it is needed after a restart or eviction.
+    """
+
+    def __init__(self, settings: DeckSettings, session_factory=AsyncSessionLocal):
+        self.settings = settings
+        self._session_factory = session_factory
+        self._decks: "OrderedDict[Tuple[str, int], Deck]" = OrderedDict()
+        # Decks with unsaved draws, including ones already evicted from the LRU
+        self._dirty: Dict[Tuple[str, int], Deck] = {}
+        self._flusher = PeriodicTask(
+            "Question deck flush",
+            self.flush,
+            settings.flush_seconds,
+            run_on_stop=settings.persist,
+        )
+        self.draws = 0
+        self.loads = 0
+        self.evictions = 0
+        self.flushes = 0
+
+    async def draw(
+        self,
+        username: str,
+        snapshot: QuestionBankSnapshot,
+        k: int,
+        level: Optional[int] = None,
+    ) -> list[CachedQuestion]:
+        if not self.settings.enabled:
+            return snapshot.sample(k, level)
+
+        pool = snapshot.pool(level)
+        if not pool:
+            return []
+
+        key = (username, level if level is not None else ALL_LEVELS)
+        deck = self._decks.get(key)
+        if deck is None:
+            deck = await self._load(key)
+            # Another request may have created the deck while this one loaded it
+            deck = self._decks.get(key) or deck
+            if deck is None:
+                deck = Deck.shuffled(pool, snapshot.version)
+            self._remember(key, deck)
+        else:
+            self._decks.move_to_end(key)
+
+        if deck.version != snapshot.version:
+            deck.rebase(pool, snapshot.version)
+
+        self.draws += 1
+        ids = deck.draw(k)
+        if self.settings.persist:
+            self._dirty[key] = deck
+        return [snapshot.questions[i] for i in ids]
+
+    def _remember(self, key: Tuple[str, int], deck: Deck) -> None:
+        self._decks[key] = deck
+        self._decks.move_to_end(key)
+        while len(self._decks) > self.settings.max_decks:
+            self._decks.popitem(last=False)
+            self.evictions += 1
+
+    async def _load(self, key: Tuple[str, int]) -> Optional[Deck]:
+        if not self.settings.persist:
+            return None
+        # An evicted deck whose draws are not flushed yet is newer than the table
+        if key in self._dirty:
+            return self._dirty[key]
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(UserDeck.question_ids, UserDeck.position).where(
+                    UserDeck.username == key[0], UserDeck.level == key[1]
+                )
+            )
+            row = result.first()
+        if row is None:
+            return None
+        self.loads += 1
+        deck = Deck(_unpack(row.question_ids), row.position)
+        deck.ids_changed = False
+        # version None forces a rebase against the current bank on first draw
+        return deck
+
+    async def flush(self) -> int:
+        """Write decks drawn from since the last flush. Returns the number written."""
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = self._dirty, {}
+        full_rows, positions = [], []
+        for (username, level), deck in dirty.items():
+            if deck.ids_changed:
+                full_rows.append(
+                    {
+                        "username": username,
+                        "level": level,
+                        "question_ids": _pack(deck.ids),
+                        "position": deck.position,
+                    }
+                )
+            else:
+                positions.append(
+                    {"username": username, "level": level, "position": deck.position}
+                )
+
+        try:
+            async with self._session_factory() as session:
+                for start in range(0, len(full_rows), FLUSH_CHUNK_SIZE):
+                    stmt = insert(UserDeck).values(full_rows[start : start + FLUSH_CHUNK_SIZE])
+                    await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[UserDeck.username, UserDeck.level],
+                            set_={
+                                "question_ids": stmt.excluded.question_ids,
+                                "position": stmt.excluded.position,
+                            },
+                        )
+                    )
+                if positions:
+                    # ORM bulk UPDATE by primary key: one executemany for all cursors
+                    await session.execute(update(UserDeck), positions)
+                await session.commit()
+        except BaseException:
+            # Keep the decks for the next flush unless they were drawn from
+            # again, also when cancelled
+            for key, deck in dirty.items():
+                self._dirty.setdefault(key, deck)
+            raise
+
+        for key, deck in dirty.items():
+            # A deck drawn from during the write may have been reshuffled
+            # since, and its new ids still need writing
+            if key not in self._dirty:
+                deck.ids_changed = False
+        self.flushes += 1
+        return len(dirty)
+
+    async def start(self) -> None:
+        if self.settings.enabled and self.settings.persist:
+            self._flusher.start()
+
+    async def stop(self) -> None:
+        await self._flusher.stop()
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.settings.enabled,
+            "persist": self.settings.persist,
+            "decks": len(self._decks),
+            "max_decks": self.settings.max_decks,
+            "unsaved": len(self._dirty),
+            "draws": self.draws,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "flushes": self.flushes,
+            "flush_failures": self._flusher.failures,
+        }
+
+
+question_decks = QuestionDecks(get_deck_settings())
@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List, Sequence
+
+from app.models import Answer
+from app.schemas import QuestionResult, SubmittedAnswer
+from app.services.question_bank import question_bank
+from app.services.quiz_token import QuizClaims
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class GradingError(ValueError):
+    pass
+
+
+async def load_answer_key(
+    db: AsyncSession, question_ids: Iterable[int]
+) -> Dict[int, int]:
+    """
+    Map each question id to its correct answer id.
+
+    Comes from the question bank cache when every question is in it, and
+    otherwise from a single query over the questions' correct answers.
+    """
+    question_ids = set(question_ids)
+
+    snapshot = question_bank.snapshot()
+    if snapshot is not None and question_ids.issubset(snapshot.questions):
+        return {
+            question_id: a.id
+            for question_id in question_ids
+            for a in snapshot.questions[question_id].answers
+            if a.correct
+        }
+
+    result = await db.execute(
+        select(Answer.question_id, Answer.id).where(
+            Answer.question_id.in_(question_ids), Answer.correct.is_(True)
+        )
+    )
+    return {question_id: answer_id for question_id, answer_id in result}
+
+
+def grade_answers(
+    quiz: QuizClaims,
+    answer_key: Dict[int, int],
+    submitted: Sequence[SubmittedAnswer],
+) -> List[QuestionResult]:
+    """
+    Grade a submission against the answer key.
+
+    Every quiz question gets a result; unanswered questions count as wrong.
+    Questions removed from the bank since the quiz was issued are skipped.
+
+    Raises:
+        GradingError: If an answer targets a question outside the quiz, a
+            question is answered twice, or an answer id was not offered for
+            that question.
+    """
+    offered = dict(zip(quiz.question_ids, quiz.answer_ids))
+    chosen: Dict[int, int] = {}
+    for item in submitted:
+        if item.question_id not in offered:
+            raise GradingError(f"Question {item.question_id} is not part of this quiz")
+        if item.question_id in chosen:
+            raise GradingError(f"Question {item.question_id} was answered twice")
+        if item.answer_id not in offered[item.question_id]:
+            raise GradingError(
+                f"Answer {item.answer_id} does not belong to question {item.question_id}"
+            )
+        chosen[item.question_id] = item.answer_id
+
+    results = []
+    for question_id in quiz.question_ids:
+        correct_answer_id = answer_key.get(question_id)
+        if correct_answer_id is None:
+            continue
+        answer_id = chosen.get(question_id)
+        results.append(
+            QuestionResult(
+                question_id=question_id,
+                answer_id=answer_id,
+                correct=answer_id == correct_answer_id,
+                correct_answer_id=correct_answer_id,
+            )
+        )
+    return results
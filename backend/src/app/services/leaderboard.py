@@ -0,0 +1,293 @@
+import asyncio
+import bisect
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.db.session import AsyncSessionLocal
+from app.models import User
+from app.services.background import PeriodicTask
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+INITIAL_CAPACITY = 1024
+
+
+class LeaderboardSettings(BaseSettings):
+    enabled: bool = Field(default=True, alias="LEADERBOARD_ENABLED")
+    refresh_seconds: float = Field(default=300.0, alias="LEADERBOARD_REFRESH_SECONDS")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_leaderboard_settings() -> LeaderboardSettings:
+    return LeaderboardSettings()
+
+
+def _entry(rank: int, username: str, score: int) -> Dict:
+    return {"rank": rank, "username": username, "score": score}
+
+
+class RankIndex:
+    """
+    Order statistics over user scores.
+
+    A Fenwick tree counts users per score value, so the number of users above
+    a score, and the score at a given position, take O(log max_score). Users
+    with the same score are kept in sorted per-score lists. The order is
+    score descending, then username; tied users share a rank ("1, 2, 2, 4").
+    Scores are non-negative (quiz points), and the tree grows by doubling
+    when a score passes its capacity.
+    """
+
+    def __init__(self, scores: Iterable[Tuple[str, int]] = ()):
+        self._scores: Dict[str, int] = {}
+        self._buckets: Dict[int, List[str]] = {}
+        for username, score in scores:
+            score = max(score, 0)
+            self._scores[username] = score
+            self._buckets.setdefault(score, []).append(username)
+        for bucket in self._buckets.values():
+            bucket.sort()
+        self._build(max(INITIAL_CAPACITY, max(self._buckets, default=0) + 1))
+
+    def _build(self, capacity: int) -> None:
+        tree = [0] * (capacity + 1)
+        for score, bucket in self._buckets.items():
+            tree[score + 1] = len(bucket)
+        # Linear-time construction: push each node's total into its parent
+        for i in range(1, capacity + 1):
+            parent = i + (i & -i)
+            if parent <= capacity:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._capacity = capacity
+        self._top_bit = 1 << (capacity.bit_length() - 1)
+
+    def _update(self, score: int, delta: int) -> None:
+        i = score + 1
+        while i <= self._capacity:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_at_most(self, score: int) -> int:
+        i = min(score + 1, self._capacity)
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _score_at(self, ascending_index: int) -> int:
+        """Score of the user at ``ascending_index`` in ascending score order."""
+        position, remaining, step = 0, ascending_index + 1, self._top_bit
+        while step:
+            nxt = position + step
+            if nxt <= self._capacity and self._tree[nxt] < remaining:
+                position = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return position
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def score(self, username: str) -> Optional[int]:
+        return self._scores.get(username)
+
+    def set(self, username: str, score: int) -> None:
+        score = max(score, 0)
+        old = self._scores.get(username)
+        if old == score:
+            return
+        if old is not None:
+            bucket = self._buckets[old]
+            del bucket[bisect.bisect_left(bucket, username)]
+            if not bucket:
+                del self._buckets[old]
+            self._update(old, -1)
+        if score >= self._capacity:
+            self._scores[username] = score
+            self._buckets.setdefault(score, [])
+            bisect.insort(self._buckets[score], username)
+            self._build(max(self._capacity * 2, score + 1))
+            return
+        self._scores[username] = score
+        bisect.insort(self._buckets.setdefault(score, []), username)
+        self._update(score, 1)
+
+    def add(self, username: str, points: int) -> None:
+        self.set(username, self._scores.get(username, 0) + points)
+
+    def count_above(self, score: int) -> int:
+        return len(self._scores) - self._count_at_most(score)
+
+    def position(self, username: str) -> Optional[int]:
+        """Zero-based position of ``username`` in leaderboard order."""
+        score = self._scores.get(username)
+        if score is None:
+            return None
+        return self.count_above(score) + bisect.bisect_left(self._buckets[score], username)
+
+    def page(self, offset: int, limit: int) -> List[Dict]:
+        entries: List[Dict] = []
+        position = max(offset, 0)
+        end = min(position + limit, len(self._scores))
+        while position < end:
+            score = self._score_at(len(self._scores) - 1 - position)
+            above = self.count_above(score)
+            bucket = self._buckets[score]
+            for username in bucket[position - above : end - above]:
+                entries.append(_entry(above + 1, username, score))
+            position = min(above + len(bucket), end)
+        return entries
+
+
+class Leaderboard:
+    """
+    In-process leaderboard served from a ``RankIndex``.
+
+    Built from ``users`` at startup and rebuilt every ``refresh_seconds`` to
+    pick up points written by other API processes; points from this process
+    are applied as they are written. ``lock`` is held by rebuilds and by score
+    writers around their commit and ``apply``, so a rebuild never counts a
+    write twice or misses it.
+    """
+
+    def __init__(self, settings: LeaderboardSettings, session_factory=AsyncSessionLocal):
+        self.settings = settings
+        self._session_factory = session_factory
+        self._index: Optional[RankIndex] = None
+        self._refresher = PeriodicTask(
+            "Leaderboard rebuild", self.rebuild, settings.refresh_seconds
+        )
+        self.lock = asyncio.Lock()
+        self.rebuilds = 0
+        self.last_rebuild_at: Optional[float] = None
+        self.last_rebuild_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def apply(self, deltas: Dict[str, int]) -> None:
+        index = self._index
+        if index is None:
+            return
+        for username, points in deltas.items():
+            index.add(username, points)
+
+    def top(self, limit: int, offset: int = 0) -> Dict:
+        return {"total": len(self._index), "entries": self._index.page(offset, limit)}
+
+    def standing(self, username: str, neighbors: int) -> Optional[Dict]:
+        index = self._index
+        position = index.position(username)
+        if position is None:
+            return None
+        score = index.score(username)
+        start = max(position - neighbors, 0)
+        return {
+            "total": len(index),
+            "user": _entry(index.count_above(score) + 1, username, score),
+            "neighbors": index.page(start, position - start + neighbors + 1),
+        }
+
+    async def rebuild(self) -> None:
+        start = time.perf_counter()
+        async with self.lock:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(User.username, func.coalesce(User.score, 0))
+                )
+                index = RankIndex(result.tuples())
+            self._index = index
+        self.rebuilds += 1
+        self.last_rebuild_at = time.time()
+        self.last_rebuild_seconds = time.perf_counter() - start
+        logger.info(
+            "Leaderboard rebuilt with %d users in %.3fs",
+            len(index),
+            self.last_rebuild_seconds,
+        )
+
+    async def start(self) -> None:
+        if not self.settings.enabled:
+            return
+        await self._refresher.run()
+        if self.settings.refresh_seconds > 0:
+            self._refresher.start()
+
+    async def stop(self) -> None:
+        await self._refresher.stop()
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.settings.enabled,
+            "ready": self.ready,
+            "users": len(self._index) if self._index is not None else 0,
+            "rebuilds": self.rebuilds,
+            "rebuild_failures": self._refresher.failures,
+            "last_rebuild_at": self.last_rebuild_at,
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+        }
+
+
+_score = func.coalesce(User.score, 0)
+
+
+async def _fetch_page(db: AsyncSession, offset: int, limit: int) -> List[Tuple[str, int]]:
+    result = await db.execute(
+        select(User.username, _score)
+        .order_by(_score.desc(), User.username)
+        .offset(offset)
+        .limit(limit)
+    )
+    return list(result.tuples())
+
+
+async def _count_above(db: AsyncSession, score: int) -> int:
+    return await db.scalar(select(func.count()).select_from(User).where(_score > score))
+
+
+async def _with_ranks(db: AsyncSession, rows: List[Tuple[str, int]]) -> List[Dict]:
+    ranks: Dict[int, int] = {}
+    for _, score in rows:
+        if score not in ranks:
+            ranks[score] = await _count_above(db, score) + 1
+    return [_entry(ranks[score], username, score) for username, score in rows]
+
+
+async def fetch_top(db: AsyncSession, limit: int, offset: int = 0) -> Dict:
+    """``Leaderboard.top`` computed in the database, for when the index is not ready."""
+    total = await db.scalar(select(func.count(User.id)))
+    rows = await _fetch_page(db, offset, limit)
+    return {"total": total, "entries": await _with_ranks(db, rows)}
+
+
+async def fetch_standing(db: AsyncSession, username: str, neighbors: int) -> Optional[Dict]:
+    """``Leaderboard.standing`` computed in the database."""
+    score = await db.scalar(select(_score).where(User.username == username))
+    if score is None:
+        return None
+    position = await db.scalar(
+        select(func.count())
+        .select_from(User)
+        .where(
+            or_(_score > score, and_(_score == score, User.username < username))
+        )
+    )
+    start = max(position - neighbors, 0)
+    rows = await _fetch_page(db, start, position - start + neighbors + 1)
+    return {
+        "total": await db.scalar(select(func.count(User.id))),
+        "user": _entry(await _count_above(db, score) + 1, username, score),
+        "neighbors": await _with_ranks(db, rows),
+    }
+
+
+leaderboard = Leaderboard(get_leaderboard_settings())
@@ -0,0 +1,206 @@
+import asyncio
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile-request"
+MAX_STACK_DEPTH = 128
+WAITING_STACK = "(waiting: other tasks or I/O)"
+
+# Maps each running event loop to the task it is currently stepping; read from
+# the sampler thread to attribute samples to the profiled request only
+_current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+
+
+class ProfilingSettings(BaseSettings):
+    directory: str = Field(default="/tmp/math-challenger-profiles", alias="PROFILE_DIR")
+    max_files: int = Field(default=50, alias="PROFILE_MAX_FILES")
+    header_secret: Optional[str] = Field(default=None, alias="PROFILE_HEADER_SECRET")
+    sample_rate: float = Field(default=0.0, alias="PROFILE_SAMPLE_RATE")
+    interval_ms: float = Field(default=2.0, alias="PROFILE_INTERVAL_MS")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_profiling_settings() -> ProfilingSettings:
+    return ProfilingSettings()
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the Python stack of one thread at a fixed interval.
+
+    When ``task`` is given, samples taken while the event loop is running
+    another task (or waiting for I/O) are counted as waiting rather than
+    attributed to whatever else the loop was doing.
+    """
+
+    def __init__(self, thread_id: int, interval: float, loop=None, task=None):
+        super().__init__(daemon=True, name="request-profiler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.loop = loop
+        self.task = task
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            if (
+                self.task is not None
+                and _current_tasks is not None
+                and _current_tasks.get(self.loop) is not self.task
+            ):
+                self.stacks[WAITING_STACK] += 1
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            frames: List[str] = []
+            while frame is not None and len(frames) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                frames.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if frames:
+                # The sampler's own frames are never on the sampled thread
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class RequestProfiler:
+    """
+    Profiles individual requests, chosen by a secret request header or by a
+    sampling rate that admins can change at runtime, and writes each profile
+    as collapsed stacks (for flamegraph.pl or speedscope) into a directory that
+    keeps only the newest ``max_files`` profiles.
+    """
+
+    def __init__(self, settings: ProfilingSettings):
+        self.settings = settings
+        self.sample_rate = settings.sample_rate
+        self._secret = (
+            settings.header_secret.encode() if settings.header_secret else None
+        )
+        self.profiled = 0
+
+    @property
+    def armed(self) -> bool:
+        return self._secret is not None or self.sample_rate > 0
+
+    def should_profile(self, headers: List) -> bool:
+        if self._secret is not None:
+            for name, value in headers:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self._secret)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> StackSampler:
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        sampler = StackSampler(
+            threading.get_ident(), self.settings.interval_ms / 1000, loop, task
+        )
+        sampler.start()
+        return sampler
+
+    def write(self, method: str, route: str, elapsed: float, stacks: Counter) -> str:
+        os.makedirs(self.settings.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        now = time.time()
+        filename = (
+            f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(now))}"
+            f"-{int(now * 1000) % 1000:03d}-{method}-{slug}-{elapsed * 1000:.0f}ms.collapsed"
+        )
+        path = os.path.join(self.settings.directory, filename)
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self._prune()
+        self.profiled += 1
+        return path
+
+    def _prune(self) -> None:
+        profiles = self.list_profiles()
+        for name in profiles[self.settings.max_files :]:
+            try:
+                os.remove(os.path.join(self.settings.directory, name))
+            except OSError:
+                pass
+
+    def list_profiles(self) -> List[str]:
+        """Profile file names, newest first."""
+        try:
+            names = [
+                name
+                for name in os.listdir(self.settings.directory)
+                if name.endswith(".collapsed")
+            ]
+        except FileNotFoundError:
+            return []
+        return sorted(names, reverse=True)
+
+    def stats(self) -> Dict:
+        return {
+            "header_enabled": self._secret is not None,
+            "sample_rate": self.sample_rate,
+            "directory": self.settings.directory,
+            "profiled": self.profiled,
+            "profiles": self.list_profiles(),
+        }
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests under ``path_prefix`` when the
+    profiler picks them. Unselected requests cost one attribute check, or a
+    header scan and a random draw while profiling is armed.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler, path_prefix: str):
+        self.app = app
+        self.profiler = profiler
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not self.profiler.armed
+            or scope["type"] != "http"
+            or not scope["path"].startswith(self.path_prefix)
+            or not self.profiler.should_profile(scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = self.profiler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+            route = getattr(scope.get("route"), "path", scope["path"])
+            try:
+                # The response has already been sent; write off the event loop
+                await asyncio.to_thread(
+                    self.profiler.write, scope["method"], route, elapsed, sampler.stacks
+                )
+            except OSError:
+                logger.exception("Could not write request profile")
+
+
+request_profiler = RequestProfiler(get_profiling_settings())
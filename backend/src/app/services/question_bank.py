@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from app.db.session import AsyncSessionLocal
+from app.models import BANK_VERSION_ID, Answer, Question, QuestionBankVersion
+from app.services.background import PeriodicTask
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionBankSettings(BaseSettings):
+    enabled: bool = Field(default=True, alias="QUESTION_CACHE_ENABLED")
+    refresh_seconds: float = Field(default=30.0, alias="QUESTION_CACHE_REFRESH_SECONDS")
+    max_questions: int = Field(default=100_000, alias="QUESTION_CACHE_MAX_QUESTIONS")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_question_bank_settings() -> QuestionBankSettings:
+    return QuestionBankSettings()
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAnswer:
+    id: int
+    answer: str
+    correct: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CachedQuestion:
+    id: int
+    question: str
+    level: int
+    answers: Tuple[CachedAnswer, ...]
+
+    def shuffled_answers(self) -> list[CachedAnswer]:
+        return random.sample(self.answers, len(self.answers))
+
+
+@dataclass(frozen=True)
+class QuestionBankSnapshot:
+    """Immutable view of the question bank; replaced wholesale on refresh."""
+
+    version: int
+    fingerprint: Tuple
+    loaded_at: float
+    # The question_bank_version counter the snapshot was loaded at (0 if unset)
+    bank_version: int
+    questions: Dict[int, CachedQuestion]
+    ids: Tuple[int, ...]
+    ids_by_level: Dict[int, Tuple[int, ...]] = field(default_factory=dict)
+
+    def pool(self, level: Optional[int] = None) -> Tuple[int, ...]:
+        if level is None:
+            return self.ids
+        return self.ids_by_level.get(level, ())
+
+    def sample(self, k: int, level: Optional[int] = None) -> list[CachedQuestion]:
+        ids = self.pool(level)
+        return [self.questions[i] for i in random.sample(ids, min(k, len(ids)))]
+
+
+async def _fetch_fingerprint(session: AsyncSession) -> Tuple:
+    # seeds/seed.py bumps the bank version on every change. The max ids, both
+    # primary key lookups, also catch rows inserted without it; nothing here
+    # scans a table, so polling stays cheap however large the bank grows.
+    stmt = select(
+        select(QuestionBankVersion.version)
+        .where(QuestionBankVersion.id == BANK_VERSION_ID)
+        .scalar_subquery(),
+        select(func.max(Question.id)).scalar_subquery(),
+        select(func.max(Answer.id)).scalar_subquery(),
+    )
+    result = await session.execute(stmt)
+    return tuple(result.one())
+
+
+async def _load_snapshot(
+    session: AsyncSession, version: int, fingerprint: Tuple
+) -> QuestionBankSnapshot:
+    # Questions before answers: answers added in between belong to questions
+    # not in the snapshot and are dropped, whereas the other order could load
+    # a new question without the answers written after they were read
+    result = await session.execute(
+        select(Question.id, Question.question, Question.level).order_by(Question.id)
+    )
+    rows = result.all()
+
+    result = await session.execute(
+        select(Answer.id, Answer.question_id, Answer.answer, Answer.correct).order_by(
+            Answer.id
+        )
+    )
+    answers_by_question: Dict[int, list[CachedAnswer]] = {}
+    for answer_id, question_id, text, correct in result:
+        answers_by_question.setdefault(question_id, []).append(
+            CachedAnswer(id=answer_id, answer=text, correct=correct)
+        )
+
+    questions: Dict[int, CachedQuestion] = {}
+    ids_by_level: Dict[int, list[int]] = {}
+    for question_id, text, level in rows:
+        questions[question_id] = CachedQuestion(
+            id=question_id,
+            question=text,
+            level=level,
+            answers=tuple(answers_by_question.get(question_id, ())),
+        )
+        ids_by_level.setdefault(level, []).append(question_id)
+
+    return QuestionBankSnapshot(
+        version=version,
+        fingerprint=fingerprint,
+        loaded_at=time.time(),
+        bank_version=fingerprint[0] or 0,
+        questions=questions,
+        ids=tuple(questions),
+        ids_by_level={level: tuple(ids) for level, ids in ids_by_level.items()},
+    )
+
+
+class QuestionBankCache:
+    """
+    Read-mostly in-process copy of the questions and answers tables.
+
+    Readers grab the current snapshot reference without locking; a background
+    task polls a cheap fingerprint query and swaps in a new snapshot when the
+    bank changes. When the bank grows beyond ``max_questions`` the cache stays
+    cold and callers fall back to the database.
+    """
+
+    def __init__(self, settings: QuestionBankSettings, session_factory=AsyncSessionLocal):
+        self.settings = settings
+        self._session_factory = session_factory
+        self._snapshot: Optional[QuestionBankSnapshot] = None
+        # Fingerprint of a bank found too large to cache, so it is not
+        # counted again until it changes
+        self._oversized: Optional[Tuple] = None
+        self._refresh_lock = asyncio.Lock()
+        self._refresher = PeriodicTask(
+            "Question bank cache refresh", self.refresh, settings.refresh_seconds
+        )
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.last_checked_at: Optional[float] = None
+
+    def snapshot(self) -> Optional[QuestionBankSnapshot]:
+        """Return the current snapshot, counting the lookup as a hit or miss."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return snapshot
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Reload the snapshot if the bank changed. Returns True if it was swapped."""
+        async with self._refresh_lock:
+            async with self._session_factory() as session:
+                fingerprint = await _fetch_fingerprint(session)
+                self.last_checked_at = time.time()
+                current = self._snapshot
+                unchanged = current is not None and current.fingerprint == fingerprint
+                if not force and (unchanged or fingerprint == self._oversized):
+                    return False
+
+                # Counted only when the bank changed, not on every poll
+                count = await session.scalar(select(func.count(Question.id)))
+                if count > self.settings.max_questions:
+                    self._oversized = fingerprint
+                    logger.warning(
+                        "Question bank has %d questions (limit %d); cache disabled",
+                        count,
+                        self.settings.max_questions,
+                    )
+                    self._snapshot = None
+                    return False
+
+                version = current.version + 1 if current is not None else 1
+                self._snapshot = await _load_snapshot(session, version, fingerprint)
+                self.refreshes += 1
+                logger.info(
+                    "Question bank cache loaded version %d (%d questions)",
+                    version,
+                    len(self._snapshot.questions),
+                )
+                return True
+
+    async def start(self) -> None:
+        if not self.settings.enabled:
+            return
+        # Without a snapshot yet, a plain refresh always loads one
+        await self._refresher.run()
+        self._refresher.start()
+
+    async def stop(self) -> None:
+        await self._refresher.stop()
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        return {
+            "enabled": self.settings.enabled,
+            "ready": snapshot is not None,
+            "version": snapshot.version if snapshot else None,
+            "bank_version": snapshot.bank_version if snapshot else None,
+            "questions": len(snapshot.questions) if snapshot else 0,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "last_checked_at": self.last_checked_at,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self._refresher.failures,
+        }
+
+
+question_bank = QuestionBankCache(get_question_bank_settings())
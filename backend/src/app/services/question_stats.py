@@ -0,0 +1,244 @@
+import asyncio
+import bisect
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.db.session import AsyncSessionLocal
+from app.models import Answer, QuestionStat
+from app.schemas import QuestionResult
+from app.services.background import PeriodicTask
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NO_ANSWER = 0
+NO_TIME = 0
+# Upper bounds of response-time buckets 1..n in milliseconds; bucket n + 1 is
+# everything slower. Bucket 0 holds answers submitted without a time.
+TIME_BUCKETS_MS = (
+    1_000, 2_000, 3_000, 5_000, 7_500, 10_000, 15_000, 20_000, 30_000, 60_000, 120_000
+)
+# Three bind parameters per row
+UPSERT_CHUNK_SIZE = 5_000
+
+
+class QuestionStatsSettings(BaseSettings):
+    enabled: bool = Field(default=True, alias="QUESTION_STATS_ENABLED")
+    flush_seconds: float = Field(default=10.0, alias="QUESTION_STATS_FLUSH_SECONDS")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_question_stats_settings() -> QuestionStatsSettings:
+    return QuestionStatsSettings()
+
+
+def time_bucket(elapsed_ms: Optional[int]) -> int:
+    if elapsed_ms is None:
+        return NO_TIME
+    return bisect.bisect_left(TIME_BUCKETS_MS, elapsed_ms) + 1
+
+
+def estimate_median_ms(buckets: Mapping[int, int]) -> Optional[float]:
+    """
+    Median response time from bucket counts, interpolated linearly inside the
+    bucket that holds it. Answers slower than the last bound count as that bound.
+    """
+    timed = sorted((b, n) for b, n in buckets.items() if b != NO_TIME and n)
+    total = sum(n for _, n in timed)
+    if not total:
+        return None
+    half = total / 2
+    seen = 0
+    for bucket, count in timed:
+        if seen + count >= half:
+            lower = TIME_BUCKETS_MS[bucket - 2] if bucket > 1 else 0
+            upper = TIME_BUCKETS_MS[min(bucket - 1, len(TIME_BUCKETS_MS) - 1)]
+            return lower + (upper - lower) * (half - seen) / count
+        seen += count
+    return None
+
+
+class QuestionStatsRecorder:
+    """
+    Counts answer picks per question, answer and response-time bucket.
+
+    Recording only increments an in-memory counter. A background task merges
+    the counters into ``question_stats`` every ``flush_seconds`` with one
+    multi-row upsert that adds to the stored counts, and once more on shutdown.
+    """
+
+    def __init__(self, settings: QuestionStatsSettings, session_factory=AsyncSessionLocal):
+        self.settings = settings
+        self._session_factory = session_factory
+        self._pending: Dict[Tuple[int, int, int], int] = {}
+        self._lock = asyncio.Lock()
+        self._flusher = PeriodicTask(
+            "Question stats flush", self.flush, settings.flush_seconds, run_on_stop=True
+        )
+        self.recorded = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.last_flush_at: Optional[float] = None
+
+    def record(
+        self, results: Sequence[QuestionResult], elapsed_ms: Mapping[int, int]
+    ) -> None:
+        if not self.settings.enabled:
+            return
+        for result in results:
+            key = (
+                result.question_id,
+                result.answer_id if result.answer_id is not None else NO_ANSWER,
+                time_bucket(elapsed_ms.get(result.question_id)),
+            )
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self.recorded += len(results)
+
+    async def flush(self) -> int:
+        """Write pending counters. Returns the number of rows upserted."""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            rows = [
+                {"question_id": q, "answer_id": a, "time_bucket": b, "count": n}
+                for (q, a, b), n in sorted(pending.items())
+            ]
+            try:
+                async with self._session_factory() as session:
+                    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                        stmt = insert(QuestionStat).values(
+                            rows[start : start + UPSERT_CHUNK_SIZE]
+                        )
+                        await session.execute(
+                            stmt.on_conflict_do_update(
+                                index_elements=[
+                                    QuestionStat.question_id,
+                                    QuestionStat.answer_id,
+                                    QuestionStat.time_bucket,
+                                ],
+                                set_={"count": QuestionStat.count + stmt.excluded.count},
+                            )
+                        )
+                    await session.commit()
+            except BaseException:
+                # Merge back, also when cancelled, for the next flush
+                for key, count in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + count
+                raise
+            self.flushes += 1
+            self.rows_written += len(rows)
+            self.last_flush_at = time.time()
+            return len(rows)
+
+    async def start(self) -> None:
+        if self.settings.enabled:
+            self._flusher.start()
+
+    async def stop(self) -> None:
+        await self._flusher.stop()
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.settings.enabled,
+            "pending_rows": len(self._pending),
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "flush_failures": self._flusher.failures,
+            "rows_written": self.rows_written,
+            "last_flush_at": self.last_flush_at,
+        }
+
+
+_answer_join = and_(
+    Answer.id == QuestionStat.answer_id, Answer.question_id == QuestionStat.question_id
+)
+# Counts for answers the question still has, plus unanswered attempts; counts
+# for answers replaced by seeding describe old content and are left out
+_current = or_(QuestionStat.answer_id == NO_ANSWER, Answer.id.is_not(None))
+
+
+async def fetch_question_stats(db: AsyncSession, question_id: int) -> Optional[Dict]:
+    """Accuracy, answer distribution and response times of one question."""
+    result = await db.execute(
+        select(
+            QuestionStat.answer_id,
+            Answer.answer,
+            Answer.correct,
+            QuestionStat.time_bucket,
+            QuestionStat.count,
+        )
+        .select_from(QuestionStat)
+        .outerjoin(Answer, _answer_join)
+        .where(QuestionStat.question_id == question_id, _current)
+    )
+    rows = result.all()
+    if not rows:
+        return None
+
+    answers: Dict[int, Dict] = {}
+    buckets: Dict[int, int] = {}
+    attempts = correct = 0
+    for answer_id, text, is_correct, bucket, count in rows:
+        attempts += count
+        if is_correct:
+            correct += count
+        buckets[bucket] = buckets.get(bucket, 0) + count
+        entry = answers.setdefault(
+            answer_id,
+            {
+                "answer_id": answer_id if answer_id != NO_ANSWER else None,
+                "answer": text,
+                "correct": bool(is_correct),
+                "count": 0,
+            },
+        )
+        entry["count"] += count
+
+    return {
+        "question_id": question_id,
+        "attempts": attempts,
+        "correct": correct,
+        "accuracy": correct / attempts,
+        "answers": sorted(answers.values(), key=lambda a: -a["count"]),
+        "median_ms": estimate_median_ms(buckets),
+        "untimed": buckets.get(NO_TIME, 0),
+        "time_buckets": [
+            {
+                "max_ms": TIME_BUCKETS_MS[b - 1] if b <= len(TIME_BUCKETS_MS) else None,
+                "count": buckets.get(b, 0),
+            }
+            for b in range(1, len(TIME_BUCKETS_MS) + 2)
+        ],
+    }
+
+
+async def fetch_question_accuracy(
+    db: AsyncSession, min_attempts: int, limit: int
+) -> List[Dict]:
+    """Questions with at least ``min_attempts`` attempts, least accurate first."""
+    attempts = func.sum(QuestionStat.count)
+    correct = func.coalesce(
+        func.sum(case((Answer.correct.is_(True), QuestionStat.count), else_=0)), 0
+    )
+    accuracy = correct * 1.0 / attempts
+    result = await db.execute(
+        select(QuestionStat.question_id, attempts, correct, accuracy)
+        .select_from(QuestionStat)
+        .outerjoin(Answer, _answer_join)
+        .where(_current)
+        .group_by(QuestionStat.question_id)
+        .having(attempts >= min_attempts)
+        .order_by(accuracy, QuestionStat.question_id)
+        .limit(limit)
+    )
+    return [
+        {"question_id": q, "attempts": n, "correct": c, "accuracy": a}
+        for q, n, c, a in result
+    ]
+
+
+question_stats = QuestionStatsRecorder(get_question_stats_settings())
@@ -0,0 +1,150 @@
+import random
+from typing import Dict, Optional
+
+from app.models import Question
+from app.services.decks import question_decks
+from app.services.question_bank import question_bank
+from app.services.ratings import CANDIDATES_PER_QUESTION, ratings
+from app.services.sampling import fetch_id_bounds, sample_question_ids
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+VALID_LEVELS = (10, 11, 12)
+MAX_QUIZ_SIZE = 100
+
+
+def parse_level_mix(mix: str) -> Dict[int, int]:
+    """
+    Parse a per-level question count such as ``"10:4,11:3,12:3"``.
+
+    Raises:
+        ValueError: If the string is malformed, names an unknown level or asks
+            for more than ``MAX_QUIZ_SIZE`` questions in total.
+    """
+    counts: Dict[int, int] = {}
+    for part in mix.split(","):
+        level_str, sep, count_str = part.strip().partition(":")
+        if not sep:
+            raise ValueError(f"Expected level:count, got '{part.strip()}'")
+        level, count = int(level_str), int(count_str)
+        if level not in VALID_LEVELS:
+            raise ValueError(f"Invalid level {level}")
+        if count < 1:
+            raise ValueError(f"Count for level {level} must be positive")
+        counts[level] = counts.get(level, 0) + count
+
+    if sum(counts.values()) > MAX_QUIZ_SIZE:
+        raise ValueError(f"A quiz can have at most {MAX_QUIZ_SIZE} questions")
+    return counts
+
+
+def serialize_question(question, answers, include_correct: bool = False) -> Dict:
+    return {
+        "id": question.id,
+        "question": question.question,
+        "level": question.level,
+        "answers": [
+            (
+                {"id": a.id, "answer": a.answer, "correct": a.correct}
+                if include_correct
+                else {"id": a.id, "answer": a.answer}
+            )
+            for a in answers
+        ],
+    }
+
+
+async def build_quiz(
+    db: AsyncSession,
+    counts: Dict[Optional[int], int],
+    username: Optional[str] = None,
+) -> list[Dict]:
+    """
+    Assemble a quiz with ``counts[level]`` random questions per level.
+
+    A ``None`` level draws from the whole bank. Served from the question bank
+    cache when it is warm, drawing from ``username``'s decks so questions do
+    not repeat until the user has seen them all; otherwise sampling runs in
+    the database (with replacement across calls) and all
+    questions and answers are loaded with one ``selectinload`` query pair, so
+    the number of statements does not grow with the quiz size.
+    """
+    snapshot = question_bank.snapshot()
+    if snapshot is not None:
+        selected = []
+        for level, count in counts.items():
+            if username is not None:
+                selected.extend(
+                    await question_decks.draw(username, snapshot, count, level)
+                )
+            else:
+                selected.extend(snapshot.sample(count, level))
+        random.shuffle(selected)
+        return [serialize_question(q, q.shuffled_answers()) for q in selected]
+
+    bounds = await fetch_id_bounds(db)
+    question_ids: list[int] = []
+    for level, count in counts.items():
+        question_ids.extend(await sample_question_ids(db, count, level, bounds))
+    if not question_ids:
+        return []
+
+    result = await db.execute(
+        select(Question)
+        .where(Question.id.in_(question_ids))
+        .options(selectinload(Question.answers))
+    )
+    selected = list(result.scalars())
+    random.shuffle(selected)
+    return [
+        serialize_question(q, random.sample(q.answers, len(q.answers)))
+        for q in selected
+    ]
+
+
+async def build_adaptive_quiz(db: AsyncSession, rating: float, n: int) -> list[Dict]:
+    """
+    Assemble a quiz of ``n`` questions rated close to ``rating``.
+
+    Uses the in-memory rating index with the question bank cache. Otherwise
+    the nearest questions above and below the rating are read through
+    ``ix_questions_rating``, which touches a few rows rather than the table.
+    """
+    snapshot = question_bank.snapshot()
+    if snapshot is not None and ratings.ready:
+        selected = [
+            snapshot.questions[question_id]
+            for question_id in ratings.nearest(rating, n, snapshot.questions)
+        ]
+        return [serialize_question(q, q.shuffled_answers()) for q in selected]
+
+    candidates = n * CANDIDATES_PER_QUESTION
+    above = await db.execute(
+        select(Question.id, Question.rating)
+        .where(Question.rating >= rating)
+        .order_by(Question.rating)
+        .limit(candidates)
+    )
+    below = await db.execute(
+        select(Question.id, Question.rating)
+        .where(Question.rating < rating)
+        .order_by(Question.rating.desc())
+        .limit(candidates)
+    )
+    nearest = sorted([*above, *below], key=lambda row: abs(row.rating - rating))
+    question_ids = random.sample(
+        [row.id for row in nearest[:candidates]], min(n, len(nearest))
+    )
+    if not question_ids:
+        return []
+
+    result = await db.execute(
+        select(Question)
+        .where(Question.id.in_(question_ids))
+        .options(selectinload(Question.answers))
+    )
+    return [
+        serialize_question(q, random.sample(q.answers, len(q.answers)))
+        for q in result.scalars()
+    ]
@@ -0,0 +1,177 @@
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Tuple
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION = 1
+SIGNATURE_BYTES = 16
+
+# version, issued_at, user tag, question count
+_HEADER = struct.Struct(">BIQH")
+# question id, answer count
+_QUESTION = struct.Struct(">IB")
+
+
+class QuizSettings(BaseSettings):
+    secret: Optional[str] = Field(default=None, alias="QUIZ_TOKEN_SECRET")
+    ttl_seconds: int = Field(default=3600, alias="QUIZ_TTL_SECONDS")
+    replay_cache_size: int = Field(default=50_000, alias="QUIZ_REPLAY_CACHE_SIZE")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_quiz_settings() -> QuizSettings:
+    return QuizSettings()
+
+
+class InvalidQuizToken(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class QuizClaims:
+    issued_at: int
+    user_tag: int
+    question_ids: Tuple[int, ...]
+    answer_ids: Tuple[Tuple[int, ...], ...]
+
+
+def _user_tag(username: str) -> int:
+    return int.from_bytes(hashlib.sha256(username.encode()).digest()[:8], "big")
+
+
+def spent_key(token: str) -> bytes:
+    """Key of a graded token in ``spent_quizzes``."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class QuizTokenCodec:
+    """
+    Issues and verifies HMAC-signed quiz tokens.
+
+    A token carries the quiz's question ids, each question's answer ids in
+    the order they were shown, the issue time and a tag of the user it was
+    issued to, packed as binary and base64url encoded. Any replica holding the
+    same ``QUIZ_TOKEN_SECRET`` can verify a submission without shared state.
+
+    Stateless tokens cannot be revoked, so graded tokens are recorded in
+    ``spent_quizzes``, in the same transaction as the points they add (see
+    ``app.services.scores``). Each replica also remembers the tokens it has
+    graded until they expire, to turn resubmissions away without a query.
+    """
+
+    def __init__(self, settings: QuizSettings):
+        self.settings = settings
+        secret = settings.secret
+        if not secret:
+            logger.warning(
+                "QUIZ_TOKEN_SECRET is not set; using a per-process secret, so quiz "
+                "tokens only verify on the replica that issued them"
+            )
+            secret = secrets.token_hex(32)
+        self._secret = secret.encode()
+        self._spent: "OrderedDict[bytes, int]" = OrderedDict()
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+    def issue(
+        self,
+        username: str,
+        question_ids: Sequence[int],
+        answer_ids: Sequence[Sequence[int]],
+    ) -> str:
+        parts = [
+            _HEADER.pack(
+                TOKEN_VERSION, int(time.time()), _user_tag(username), len(question_ids)
+            )
+        ]
+        for question_id, answers in zip(question_ids, answer_ids):
+            parts.append(_QUESTION.pack(question_id, len(answers)))
+            parts.append(struct.pack(f">{len(answers)}I", *answers))
+        payload = b"".join(parts)
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def verify(self, token: str, username: str) -> QuizClaims:
+        """
+        Check the signature, owner and age of a token and unpack it.
+
+        Raises:
+            InvalidQuizToken: If the token is malformed, forged, expired or was
+                issued to another user.
+        """
+        try:
+            payload_b64, signature_b64 = token.split(".")
+            payload, signature = _b64decode(payload_b64), _b64decode(signature_b64)
+        except ValueError:
+            raise InvalidQuizToken("Malformed quiz token")
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidQuizToken("Invalid quiz token signature")
+
+        try:
+            version, issued_at, user_tag, count = _HEADER.unpack_from(payload)
+            offset = _HEADER.size
+            question_ids, answer_ids = [], []
+            for _ in range(count):
+                question_id, answer_count = _QUESTION.unpack_from(payload, offset)
+                offset += _QUESTION.size
+                answers = struct.unpack_from(f">{answer_count}I", payload, offset)
+                offset += 4 * answer_count
+                question_ids.append(question_id)
+                answer_ids.append(answers)
+        except struct.error:
+            raise InvalidQuizToken("Malformed quiz token")
+
+        if version != TOKEN_VERSION:
+            raise InvalidQuizToken("Unsupported quiz token version")
+        if user_tag != _user_tag(username):
+            raise InvalidQuizToken("Quiz token was issued to another user")
+        if time.time() - issued_at > self.settings.ttl_seconds:
+            raise InvalidQuizToken("Quiz token has expired")
+
+        return QuizClaims(issued_at, user_tag, tuple(question_ids), tuple(answer_ids))
+
+    def expires_at(self, claims: QuizClaims) -> datetime:
+        return datetime.fromtimestamp(
+            claims.issued_at + self.settings.ttl_seconds, timezone.utc
+        )
+
+    def is_spent(self, token: str) -> bool:
+        """Whether this replica has already graded the token."""
+        return spent_key(token) in self._spent
+
+    def mark_spent(self, token: str, claims: QuizClaims) -> None:
+        """Remember a token whose points have been recorded."""
+        now = time.time()
+        while self._spent:
+            oldest_key, oldest_issued = next(iter(self._spent.items()))
+            if now - oldest_issued <= self.settings.ttl_seconds:
+                break
+            del self._spent[oldest_key]
+
+        self._spent[spent_key(token)] = claims.issued_at
+        while len(self._spent) > self.settings.replay_cache_size:
+            self._spent.popitem(last=False)
+
+
+quiz_tokens = QuizTokenCodec(get_quiz_settings())
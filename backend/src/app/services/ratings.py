@@ -0,0 +1,338 @@
+import asyncio
+import bisect
+import logging
+import random
+from collections import OrderedDict
+from typing import Container, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.db.session import AsyncSessionLocal
+from app.models import INITIAL_RATING, Question, User
+from app.schemas import QuestionResult
+from app.services.background import PeriodicTask
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+logger = logging.getLogger(__name__)
+
+# Ratings move faster until a user or question has this many graded answers
+PROVISIONAL_ATTEMPTS = 20
+# Adaptive quizzes sample from this many times as many nearest questions, so
+# users with the same rating do not all get the same quiz
+CANDIDATES_PER_QUESTION = 3
+
+
+class RatingSettings(BaseSettings):
+    enabled: bool = Field(default=True, alias="RATINGS_ENABLED")
+    k_factor: float = Field(default=24.0, alias="RATING_K_FACTOR")
+    flush_seconds: float = Field(default=5.0, alias="RATING_FLUSH_SECONDS")
+    refresh_seconds: float = Field(default=300.0, alias="RATING_REFRESH_SECONDS")
+    max_users: int = Field(default=100_000, alias="RATING_MAX_USERS")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_rating_settings() -> RatingSettings:
+    return RatingSettings()
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    """Probability that a player rated ``rating`` beats one rated ``opponent``."""
+    return 1.0 / (1.0 + 10.0 ** ((opponent - rating) / 400.0))
+
+
+class QuestionRatingIndex:
+    """
+    Question ratings kept in a sorted list of ``(rating, id)`` keys.
+
+    Finding the questions nearest a rating is a binary search plus a walk over
+    the results, independent of bank size. Changing a rating moves one key,
+    which is a single memmove of the list.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, float, int]] = ()):
+        self._ratings: Dict[int, float] = {}
+        self._attempts: Dict[int, int] = {}
+        for question_id, rating, attempts in rows:
+            self._ratings[question_id] = rating
+            self._attempts[question_id] = attempts
+        self._keys: List[Tuple[float, int]] = sorted(
+            (rating, question_id) for question_id, rating in self._ratings.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self._ratings
+
+    def get(self, question_id: int) -> Tuple[float, int]:
+        return self._ratings[question_id], self._attempts[question_id]
+
+    def adjust(self, question_id: int, delta: float, attempts: int) -> None:
+        old = self._ratings[question_id]
+        del self._keys[bisect.bisect_left(self._keys, (old, question_id))]
+        new = old + delta
+        bisect.insort(self._keys, (new, question_id))
+        self._ratings[question_id] = new
+        self._attempts[question_id] += attempts
+
+    def nearest(
+        self, rating: float, k: int, allowed: Optional[Container[int]] = None
+    ) -> List[int]:
+        """Up to ``k`` ids with ratings closest to ``rating``, skipping ids not in ``allowed``."""
+        keys = self._keys
+        hi = bisect.bisect_left(keys, (rating, -1))
+        lo = hi - 1
+        found: List[int] = []
+        while len(found) < k and (lo >= 0 or hi < len(keys)):
+            if hi >= len(keys) or (lo >= 0 and rating - keys[lo][0] <= keys[hi][0] - rating):
+                question_id = keys[lo][1]
+                lo -= 1
+            else:
+                question_id = keys[hi][1]
+                hi += 1
+            if allowed is None or question_id in allowed:
+                found.append(question_id)
+        return found
+
+
+class RatingService:
+    """
+    Incremental Elo ratings for users and questions.
+
+    Each graded answer is a match between the user and the question: a correct
+    answer moves the user up and the question down by ``k * (1 - expected)``.
+    Ratings change in memory at submission time; the accumulated deltas are
+    written every ``flush_seconds`` as increments, so several API processes
+    can update the same rows without overwriting each other. Question ratings
+    are reloaded every ``refresh_seconds`` to pick up other processes' changes
+    and new questions.
+    """
+
+    def __init__(self, settings: RatingSettings, session_factory=AsyncSessionLocal):
+        self.settings = settings
+        self._session_factory = session_factory
+        self._index: Optional[QuestionRatingIndex] = None
+        self._users: "OrderedDict[str, List]" = OrderedDict()
+        # Unwritten [rating delta, attempts] per question id and per username
+        self._pending_questions: Dict[int, List] = {}
+        self._pending_users: Dict[str, List] = {}
+        # Held by flushes and rebuilds, so a rebuild sees each delta exactly once
+        self._lock = asyncio.Lock()
+        # Odd while a flush is writing deltas it took out of the pending dicts
+        self._flush_generation = 0
+        self._flusher = PeriodicTask(
+            "Rating flush", self.flush, settings.flush_seconds, run_on_stop=True
+        )
+        self._refresher = PeriodicTask(
+            "Question rating index rebuild", self.rebuild, settings.refresh_seconds
+        )
+        self.answers_rated = 0
+        self.answers_skipped = 0
+        self.flushes = 0
+        self.rebuilds = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def _k(self, attempts: int) -> float:
+        if attempts < PROVISIONAL_ATTEMPTS:
+            return self.settings.k_factor * 2
+        return self.settings.k_factor
+
+    async def user_rating(self, username: str) -> Tuple[float, int]:
+        """A user's current rating and graded answer count."""
+        state = self._users.get(username)
+        while state is None:
+            flush_generation = self._flush_generation
+            if flush_generation % 2:
+                # The flush in progress holds deltas that are neither pending
+                # nor, until it commits, in the table
+                async with self._lock:
+                    continue
+            async with self._session_factory() as session:
+                row = (
+                    await session.execute(
+                        select(User.rating, User.rating_attempts).where(
+                            User.username == username
+                        )
+                    )
+                ).first()
+            # Another request may have loaded the user meanwhile
+            state = self._users.get(username)
+            # Read again if a flush started or finished during the read
+            if state is None and self._flush_generation == flush_generation:
+                rating, attempts = row if row is not None else (INITIAL_RATING, 0)
+                delta, n = self._pending_users.get(username, (0.0, 0))
+                state = [rating + delta, attempts + n]
+                self._users[username] = state
+                while len(self._users) > self.settings.max_users:
+                    self._users.popitem(last=False)
+        self._users.move_to_end(username)
+        return state[0], state[1]
+
+    async def record(self, username: str, results: Sequence[QuestionResult]) -> None:
+        """Update the user's and the questions' ratings from graded answers."""
+        if not self.settings.enabled or self._index is None:
+            self.answers_skipped += len(results)
+            return
+
+        await self.user_rating(username)
+        # Read after the await: a rebuild meanwhile replaces the index, and
+        # adjustments to the old one would be lost until the next rebuild
+        index = self._index
+        user = self._users[username]
+        user_delta = 0.0
+        rated = 0
+        for result in results:
+            if result.question_id not in index:
+                # Added to the bank since the last rebuild; left unrated
+                self.answers_skipped += 1
+                continue
+            question_rating, question_attempts = index.get(result.question_id)
+            surprise = (1.0 if result.correct else 0.0) - expected_score(
+                user[0], question_rating
+            )
+            delta = self._k(user[1]) * surprise
+            user[0] += delta
+            user[1] += 1
+            user_delta += delta
+
+            question_delta = -self._k(question_attempts) * surprise
+            index.adjust(result.question_id, question_delta, 1)
+            pending = self._pending_questions.setdefault(result.question_id, [0.0, 0])
+            pending[0] += question_delta
+            pending[1] += 1
+            rated += 1
+
+        if rated:
+            pending = self._pending_users.setdefault(username, [0.0, 0])
+            pending[0] += user_delta
+            pending[1] += rated
+            self.answers_rated += rated
+
+    def nearest(
+        self, rating: float, k: int, allowed: Optional[Container[int]] = None
+    ) -> List[int]:
+        """
+        ``k`` questions near ``rating``, chosen at random among the
+        ``CANDIDATES_PER_QUESTION * k`` nearest.
+        """
+        candidates = self._index.nearest(rating, k * CANDIDATES_PER_QUESTION, allowed)
+        return random.sample(candidates, min(k, len(candidates)))
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending_questions and not self._pending_users:
+                return
+            questions, self._pending_questions = self._pending_questions, {}
+            users, self._pending_users = self._pending_users, {}
+            self._flush_generation += 1
+            try:
+                async with self._session_factory() as session:
+                    if questions:
+                        # Increments rather than absolute values, so concurrent
+                        # writers from other processes compose
+                        connection = await session.connection()
+                        await connection.execute(
+                            update(Question.__table__)
+                            .where(Question.id == bindparam("b_id"))
+                            .values(
+                                rating=Question.rating + bindparam("b_delta"),
+                                rating_attempts=Question.rating_attempts
+                                + bindparam("b_attempts"),
+                            ),
+                            [
+                                {"b_id": question_id, "b_delta": delta, "b_attempts": n}
+                                for question_id, (delta, n) in sorted(questions.items())
+                            ],
+                        )
+                    if users:
+                        # Users are created by their first score write, which may
+                        # not have happened yet
+                        stmt = insert(User).values(
+                            [
+                                {
+                                    "username": username,
+                                    "score": 0,
+                                    "rating": INITIAL_RATING + delta,
+                                    "rating_attempts": n,
+                                }
+                                for username, (delta, n) in sorted(users.items())
+                            ]
+                        )
+                        await session.execute(
+                            stmt.on_conflict_do_update(
+                                index_elements=[User.username],
+                                set_={
+                                    "rating": User.rating
+                                    + (stmt.excluded.rating - INITIAL_RATING),
+                                    "rating_attempts": User.rating_attempts
+                                    + stmt.excluded.rating_attempts,
+                                },
+                            )
+                        )
+                    await session.commit()
+            except BaseException:
+                # Merge back, also when cancelled, for the next flush
+                for pending, written in (
+                    (self._pending_questions, questions),
+                    (self._pending_users, users),
+                ):
+                    for key, (delta, n) in written.items():
+                        entry = pending.setdefault(key, [0.0, 0])
+                        entry[0] += delta
+                        entry[1] += n
+                raise
+            finally:
+                self._flush_generation += 1
+            self.flushes += 1
+
+    async def rebuild(self) -> None:
+        """Reload question ratings from the database, keeping unwritten deltas."""
+        async with self._lock:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(Question.id, Question.rating, Question.rating_attempts)
+                )
+                rows = []
+                for question_id, rating, attempts in result:
+                    delta, n = self._pending_questions.get(question_id, (0.0, 0))
+                    rows.append((question_id, rating + delta, attempts + n))
+            self._index = QuestionRatingIndex(rows)
+            # Cached users may be stale if other processes rated them
+            self._users.clear()
+        self.rebuilds += 1
+
+    async def start(self) -> None:
+        if not self.settings.enabled:
+            return
+        await self._refresher.run()
+        self._flusher.start()
+        self._refresher.start()
+
+    async def stop(self) -> None:
+        await self._refresher.stop()
+        await self._flusher.stop()
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.settings.enabled,
+            "ready": self.ready,
+            "questions": len(self._index) if self._index is not None else 0,
+            "cached_users": len(self._users),
+            "pending_questions": len(self._pending_questions),
+            "pending_users": len(self._pending_users),
+            "answers_rated": self.answers_rated,
+            "answers_skipped": self.answers_skipped,
+            "flushes": self.flushes,
+            "flush_failures": self._flusher.failures,
+            "rebuilds": self.rebuilds,
+            "rebuild_failures": self._refresher.failures,
+        }
+
+
+ratings = RatingService(get_rating_settings())
@@ -0,0 +1,105 @@
+import random
+from typing import Optional, Tuple
+
+from app.models import Question
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PROBE_ROUNDS = 4
+MAX_PROBES_PER_ROUND = 1000
+
+
+async def fetch_id_bounds(db: AsyncSession) -> Tuple[Optional[int], Optional[int]]:
+    result = await db.execute(select(func.min(Question.id), func.max(Question.id)))
+    low, high = result.one()
+    return low, high
+
+
+async def sample_question_ids(
+    db: AsyncSession,
+    k: int,
+    level: Optional[int] = None,
+    bounds: Optional[Tuple[Optional[int], Optional[int]]] = None,
+) -> list[int]:
+    """
+    Pick up to ``k`` distinct random question ids without scanning the table.
+
+    Random ids are drawn over ``[min(id), max(id)]`` and checked with a single
+    primary-key lookup per round; rounds are retried with more probes to cover
+    gaps left by deleted rows or rows of another level. If the id range is too
+    sparse, the remainder is filled by seeking forward from a random pivot.
+    Every statement is an index lookup, so the cost depends on ``k`` and not on
+    the size of the ``questions`` table.
+
+    Args:
+        db: SQLAlchemy async session
+        k: Number of ids wanted
+        level: Only return questions of this level if given
+        bounds: Pre-fetched ``fetch_id_bounds`` result, to share across calls
+
+    Returns:
+        list: Up to ``k`` distinct question ids in random order
+    """
+    if k <= 0:
+        return []
+
+    low, high = bounds if bounds is not None else await fetch_id_bounds(db)
+    if low is None:
+        return []
+
+    chosen: list[int] = []
+    probed: set[int] = set()
+    span = high - low + 1
+    oversample = 2
+
+    for _ in range(MAX_PROBE_ROUNDS):
+        need = k - len(chosen)
+        if need <= 0 or len(probed) >= span:
+            break
+
+        target = min(need * oversample, MAX_PROBES_PER_ROUND, span - len(probed))
+        probes = set()
+        while len(probes) < target:
+            candidate = random.randint(low, high)
+            if candidate not in probed:
+                probes.add(candidate)
+        probed |= probes
+
+        stmt = select(Question.id).where(Question.id.in_(probes))
+        if level is not None:
+            stmt = stmt.where(Question.level == level)
+        found = list((await db.execute(stmt)).scalars())
+        random.shuffle(found)
+        chosen.extend(found[:need])
+        oversample *= 2
+
+    need = k - len(chosen)
+    if need > 0:
+        chosen.extend(await _seek_from_pivot(db, need, low, high, level, chosen))
+
+    random.shuffle(chosen)
+    return chosen
+
+
+async def _seek_from_pivot(
+    db: AsyncSession,
+    need: int,
+    low: int,
+    high: int,
+    level: Optional[int],
+    exclude: list[int],
+) -> list[int]:
+    pivot = random.randint(low, high)
+    found: list[int] = []
+    # Walk forward from the pivot, then wrap around to the start of the range.
+    for condition in (Question.id >= pivot, Question.id < pivot):
+        stmt = select(Question.id).where(condition).order_by(Question.id)
+        if level is not None:
+            stmt = stmt.where(Question.level == level)
+        if exclude:
+            stmt = stmt.where(Question.id.not_in(exclude))
+        stmt = stmt.limit(need - len(found))
+        found.extend((await db.execute(stmt)).scalars())
+        if len(found) >= need:
+            break
+    return found
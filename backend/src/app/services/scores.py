@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.db.session import AsyncSessionLocal
+from app.models import SpentQuiz, User
+from app.services.background import PeriodicTask
+from app.services.leaderboard import leaderboard
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# At most three bind parameters per row keeps each statement far below
+# asyncpg's limit
+UPSERT_CHUNK_SIZE = 5_000
+
+
+class ScoreSettings(BaseSettings):
+    write_behind: bool = Field(default=True, alias="SCORE_WRITE_BEHIND_ENABLED")
+    flush_seconds: float = Field(default=1.0, alias="SCORE_FLUSH_SECONDS")
+    max_pending: int = Field(default=1_000, alias="SCORE_FLUSH_MAX_PENDING")
+    purge_seconds: float = Field(default=3600.0, alias="SPENT_QUIZ_PURGE_SECONDS")
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+def get_score_settings() -> ScoreSettings:
+    return ScoreSettings()
+
+
+async def add_scores(db: AsyncSession, deltas: Dict[str, int]) -> None:
+    """
+    Add points to users' scores, creating users on their first submission.
+
+    Each chunk of users is one multi-row ``INSERT ... ON CONFLICT DO UPDATE``.
+    Rows are sorted by username so concurrent writers lock them in the same
+    order and cannot deadlock.
+    """
+    rows = [
+        {"username": username, "score": points}
+        for username, points in sorted(deltas.items())
+    ]
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = insert(User).values(rows[start : start + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.username],
+            set_={"score": func.coalesce(User.score, 0) + stmt.excluded.score},
+        )
+        await db.execute(stmt)
+
+
+class GradedQuiz(NamedTuple):
+    username: str
+    points: int
+    expires_at: datetime
+
+
+async def record_quiz_scores(
+    db: AsyncSession, quizzes: Dict[bytes, GradedQuiz]
+) -> Tuple[Dict[str, int], int]:
+    """
+    Mark graded quizzes as spent and add their points to their users' scores.
+
+    ``quizzes`` is keyed by ``quiz_token.spent_key``. Quizzes that are already
+    in ``spent_quizzes``, because another replica graded them, earn nothing.
+    Both writes go into the caller's transaction, so a quiz is spent exactly
+    when its points are added.
+
+    Returns:
+        The points added per user, and the number of quizzes already spent
+    """
+    deltas: Dict[str, int] = {}
+    recorded = 0
+    items = sorted(quizzes.items())
+    for start in range(0, len(items), UPSERT_CHUNK_SIZE):
+        stmt = (
+            insert(SpentQuiz)
+            .values(
+                [
+                    {
+                        "token_hash": key,
+                        "username": quiz.username,
+                        "expires_at": quiz.expires_at,
+                    }
+                    for key, quiz in items[start : start + UPSERT_CHUNK_SIZE]
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[SpentQuiz.token_hash])
+            .returning(SpentQuiz.token_hash)
+        )
+        for key in (await db.execute(stmt)).scalars():
+            quiz = quizzes[key]
+            deltas[quiz.username] = deltas.get(quiz.username, 0) + quiz.points
+            recorded += 1
+    await add_scores(db, deltas)
+    return deltas, len(quizzes) - recorded
+
+
+async def purge_spent_quizzes(db: AsyncSession) -> int:
+    """Delete spent quizzes whose tokens have expired and can no longer be submitted."""
+    result = await db.execute(
+        delete(SpentQuiz).where(SpentQuiz.expires_at < datetime.now(timezone.utc))
+    )
+    return result.rowcount
+
+
+class ScoreAggregator:
+    """
+    Write-behind buffer for score updates.
+
+    Graded quizzes are kept in memory; a background task records them all
+    with ``record_quiz_scores`` every ``flush_seconds``, or sooner once
+    ``max_pending`` quizzes are waiting, and once more on shutdown. A user
+    who submits many quizzes within an interval costs one score update
+    instead of one per quiz. Quizzes still buffered when the process dies
+    without a clean shutdown are lost, and can be submitted again. The
+    leaderboard picks points up when they are written, not when they are
+    submitted.
+
+    The same task also deletes expired ``spent_quizzes`` rows every
+    ``purge_seconds``, whether or not write-behind is on.
+    """
+
+    def __init__(self, settings: ScoreSettings, session_factory=AsyncSessionLocal):
+        self.settings = settings
+        self._session_factory = session_factory
+        self._pending: Dict[bytes, GradedQuiz] = {}
+        # When the oldest quiz still waiting was added (monotonic clock)
+        self._pending_since: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._flusher = PeriodicTask(
+            "Score flush", self.flush, settings.flush_seconds, run_on_stop=True
+        )
+        self._purger = PeriodicTask("Spent quiz purge", self.purge, settings.purge_seconds)
+        self.submissions = 0
+        self.already_spent = 0
+        self.purged = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.last_flush_at: Optional[float] = None
+        self.last_flush_seconds: Optional[float] = None
+        self.last_flush_lag_seconds: Optional[float] = None
+        self.max_flush_lag_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.write_behind
+
+    def add(self, key: bytes, quiz: GradedQuiz) -> bool:
+        """Buffer a graded quiz. Returns False if it is already buffered."""
+        if key in self._pending:
+            return False
+        # Zero-point submissions still create the user, as direct writes did
+        self._pending[key] = quiz
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        self.submissions += 1
+        if len(self._pending) >= self.settings.max_pending:
+            self._flusher.wake()
+        return True
+
+    async def flush(self) -> int:
+        """Record all pending quizzes. Returns the number of users updated."""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            pending_since, self._pending_since = self._pending_since, None
+
+            start = time.perf_counter()
+            try:
+                async with self._session_factory() as session:
+                    deltas, already_spent = await record_quiz_scores(session, pending)
+                    async with leaderboard.lock:
+                        await session.commit()
+                        leaderboard.apply(deltas)
+            except BaseException:
+                # Merge back, also when cancelled, so the quizzes go out with
+                # the next flush
+                self._pending.update(pending)
+                if self._pending_since is None or pending_since < self._pending_since:
+                    self._pending_since = pending_since
+                raise
+
+            lag = time.monotonic() - pending_since
+            self.flushes += 1
+            self.already_spent += already_spent
+            self.rows_written += len(deltas)
+            self.last_flush_at = time.time()
+            self.last_flush_seconds = time.perf_counter() - start
+            self.last_flush_lag_seconds = lag
+            self.max_flush_lag_seconds = max(self.max_flush_lag_seconds, lag)
+            return len(deltas)
+
+    async def purge(self) -> int:
+        async with self._session_factory() as session:
+            purged = await purge_spent_quizzes(session)
+            await session.commit()
+        self.purged += purged
+        return purged
+
+    async def start(self) -> None:
+        if self.enabled:
+            self._flusher.start()
+        self._purger.start()
+
+    async def stop(self) -> None:
+        await self._purger.stop()
+        await self._flusher.stop()
+        if self._pending:
+            logger.error(
+                "Final score flush failed; %d quizzes' points were not saved",
+                len(self._pending),
+            )
+
+    def stats(self) -> Dict:
+        return {
+            "write_behind": self.enabled,
+            "pending_quizzes": len(self._pending),
+            "pending_users": len({quiz.username for quiz in self._pending.values()}),
+            "pending_points": sum(quiz.points for quiz in self._pending.values()),
+            "oldest_pending_seconds": (
+                time.monotonic() - self._pending_since
+                if self._pending_since is not None
+                else 0.0
+            ),
+            "submissions": self.submissions,
+            "flushes": self.flushes,
+            "flush_failures": self._flusher.failures,
+            "already_spent": self.already_spent,
+            "purged": self.purged,
+            "purge_failures": self._purger.failures,
+            "rows_written": self.rows_written,
+            "last_flush_at": self.last_flush_at,
+            "last_flush_seconds": self.last_flush_seconds,
+            "last_flush_lag_seconds": self.last_flush_lag_seconds,
+            "max_flush_lag_seconds": self.max_flush_lag_seconds,
+        }
+
+
+score_aggregator = ScoreAggregator(get_score_settings())
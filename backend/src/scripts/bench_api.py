@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add backend/src and backend/seeds to sys.path
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(os.path.join(BACKEND_DIR, "src"))
+sys.path.append(os.path.join(BACKEND_DIR, "seeds"))
+
+import httpx
+from authlib.jose import JsonWebKey, JsonWebToken
+
+DEFAULT_PATHS = "/,/questions/random,/questions/ten"
+ISSUER_DOMAIN = "bench-issuer.local"
+AUDIENCE = "bench-api"
+STATEMENTS_PATH = "/_bench/statements"
+
+
+class LocalIssuer:
+    """
+    Stand-in for the identity provider: serves a JWKS over HTTP on localhost
+    and signs RS256 tokens with the matching private key, so the API's token
+    validator fetches keys and verifies signatures exactly as in production.
+    """
+
+    def __init__(self):
+        self.key = JsonWebKey.generate_key(
+            "RSA", 2048, is_private=True, options={"kid": "bench"}
+        )
+        jwks = json.dumps({"keys": [self.key.as_dict(is_private=False)]}).encode()
+
+        class JWKSHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(jwks)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), JWKSHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.jwks_url = f"http://127.0.0.1:{self.server.server_port}/jwks.json"
+
+    def token(self, subject: str, ttl_seconds: int = 3600) -> str:
+        now = int(time.time())
+        payload = {
+            "sub": subject,
+            "iss": f"https://{ISSUER_DOMAIN}/",
+            "aud": AUDIENCE,
+            "iat": now,
+            "exp": now + ttl_seconds,
+        }
+        header = {"alg": "RS256", "kid": self.key.kid}
+        return JsonWebToken(["RS256"]).encode(header, payload, self.key).decode()
+
+
+def configure_environment(args: argparse.Namespace, jwks_url: str) -> None:
+    """Point the app at the benchmark database and the local issuer. Must run before importing app."""
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["AUTH_JWT_DOMAIN"] = ISSUER_DOMAIN
+    os.environ["SWAGGER_API_AUDIENCE"] = AUDIENCE
+    os.environ["SWAGGER_CLIENT_ID"] = "bench"
+    os.environ["AUTH_JWKS_URL"] = jwks_url
+    os.environ["QUESTION_CACHE_ENABLED"] = "false" if args.no_cache else "true"
+
+
+def load_app():
+    """Import the app with SQL echo off and a counter on every statement it sends."""
+    from app.db.session import engine
+    from app.main import app
+    from sqlalchemy import event
+
+    engine.sync_engine.echo = False
+    counter = {"statements": 0}
+
+    def count_statement(*_):
+        counter["statements"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    return app, counter
+
+
+async def seed_bank(size: int, workdir: str) -> None:
+    """Recreate the tables and seed ``size`` synthetic questions through seed.py."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import seed
+        from app.models import Base
+        from generate import generate_items, write_seed_file
+
+        seed.engine.sync_engine.echo = False
+        async with seed.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        bank_file = os.path.join(workdir, "bank.ndjson")
+        write_seed_file(bank_file, generate_items(size))
+        args = seed.build_arg_parser().parse_args(["--file", bank_file, "--stream"])
+        await seed.run_and_dispose(seed.run_seeding(args))
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    path: str,
+    tokens: list[str],
+    concurrency: int,
+    requests: int,
+) -> tuple[list[float], int, float]:
+    """
+    Send ``requests`` GETs to ``path`` from ``concurrency`` concurrent workers.
+
+    Returns:
+        tuple: (latencies in seconds, non-200 responses, wall time in seconds)
+    """
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining, errors
+        sent = 0
+        while remaining > 0:
+            remaining -= 1
+            token = tokens[(worker_id + sent * concurrency) % len(tokens)]
+            sent += 1
+            start = time.perf_counter()
+            response = await client.get(
+                path, headers={"Authorization": f"Bearer {token}"}
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(
+    latencies: list[float], errors: int, elapsed: float, statements: int
+) -> dict:
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": len(latencies) / elapsed if elapsed else None,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "statements_per_request": statements / len(latencies),
+    }
+
+
+async def run_paths(client, statement_count, args, tokens) -> list[dict]:
+    """Warm up and then benchmark every path; ``statement_count`` is an async callable."""
+    results = []
+    for path in args.paths.split(","):
+        await drive(client, path, tokens, args.concurrency, args.warmup)
+        before = await statement_count()
+        latencies, errors, elapsed = await drive(
+            client, path, tokens, args.concurrency, args.requests
+        )
+        statements = await statement_count() - before
+        result = {"path": path, **summarize(latencies, errors, elapsed, statements)}
+        results.append(result)
+    return results
+
+
+async def bench_in_process(args: argparse.Namespace, tokens: list[str]) -> list[dict]:
+    app, counter = load_app()
+    from app.db.session import engine
+
+    async def statement_count() -> int:
+        return counter["statements"]
+
+    # ASGITransport does not send lifespan events, so start the app's lifespan here
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                return await run_paths(client, statement_count, args, tokens)
+    finally:
+        await engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def bench_uvicorn(args: argparse.Namespace, tokens: list[str]) -> list[dict]:
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", str(port)],
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+            for _ in range(300):
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before it was ready")
+                try:
+                    await client.get("/")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not start within 30 seconds")
+
+            async def statement_count() -> int:
+                return (await client.get(STATEMENTS_PATH)).json()["statements"]
+
+            return await run_paths(client, statement_count, args, tokens)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def serve(port: int) -> None:
+    """Run the app under uvicorn with a route reporting the statement counter."""
+    import uvicorn
+
+    app, counter = load_app()
+    app.add_api_route(STATEMENTS_PATH, lambda: counter, include_in_schema=False)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(mode: str, results: list[dict]) -> None:
+    print(f"\n{mode}")
+    print(
+        f"  {'path':<20} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'stmts/req':>9} {'errors':>6}"
+    )
+    for r in results:
+        print(
+            f"  {r['path']:<20} {r['requests_per_second']:>9.0f} {r['p50_ms']:>8.2f} "
+            f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+            f"{r['statements_per_request']:>9.2f} {r['errors']:>6}"
+        )
+
+
+async def main(args: argparse.Namespace, workdir: str) -> dict:
+    issuer = LocalIssuer()
+    configure_environment(args, issuer.jwks_url)
+    if not args.no_reset:
+        print(f"Seeding {args.bank_size} questions into {args.database_url}...")
+        await seed_bank(args.bank_size, workdir)
+    tokens = [issuer.token(f"bench|user{i}") for i in range(args.users)]
+
+    report = {
+        "revision": git_revision(),
+        "config": {
+            "bank_size": None if args.no_reset else args.bank_size,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "users": args.users,
+            "question_cache": not args.no_cache,
+        },
+        "results": {},
+    }
+    if args.mode in ("asgi", "both"):
+        report["results"]["asgi"] = await bench_in_process(args, tokens)
+        print_results("In-process (ASGI transport)", report["results"]["asgi"])
+    if args.mode in ("uvicorn", "both"):
+        report["results"]["uvicorn"] = await bench_uvicorn(args, tokens)
+        print_results("uvicorn", report["results"]["uvicorn"])
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load test the question API with locally signed tokens"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("asgi", "uvicorn", "both"),
+        default="both",
+        help="Drive the app in-process, through a real uvicorn, or both (default: both)",
+    )
+    parser.add_argument(
+        "--paths", default=DEFAULT_PATHS, help=f"Comma separated GET paths (default: {DEFAULT_PATHS})"
+    )
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients (default: 10)")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per path (default: 1000)")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per path (default: 50)")
+    parser.add_argument("--users", type=int, default=50, help="Distinct signed tokens to rotate through (default: 50)")
+    parser.add_argument("--bank-size", type=int, default=10_000, help="Synthetic questions to seed (default: 10000)")
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Scratch database; ALL ITS TABLES ARE DROPPED unless --no-reset. "
+        "Defaults to a temporary SQLite file",
+    )
+    parser.add_argument("--no-reset", action="store_true", help="Use the database's existing questions")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the question bank cache")
+    parser.add_argument("--json", default=None, help="Also write results to this file")
+    parser.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        serve(args.serve)
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory(prefix="api-bench-") as workdir:
+        # Never fall back to DATABASE_URL: the benchmark drops every table
+        args.database_url = (
+            args.database_url
+            or f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+        )
+        report = asyncio.run(main(args, workdir))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Wrote results to {args.json}")
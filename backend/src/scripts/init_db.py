@@ -6,7 +6,7 @@ import sys
 # Add backend/src to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
 
-from app.models import Answer, Base, Question, User
+from app.models import Answer, Base, Question, User, question_text_filter
 from dotenv import load_dotenv
 from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -48,7 +48,12 @@ async def seed_data():
 
         for item in data:
             question_text = item["question"]
-            if await record_exists(session, Question, question=question_text):
+            existing = await session.execute(
+                select(Question.id).where(
+                    question_text_filter([question_text], engine.dialect.name)
+                )
+            )
+            if existing.first() is not None:
                 print(f"Question '{question_text}' already exists. Skipping.")
                 continue
 
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import importlib.util
+import io
+import json
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, select
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+
+from app.models import Answer, Base, Question  # noqa: E402
+
+
+def question(level: int, correct: str) -> dict:
+    return {
+        "question": "What is 2 + 2?",
+        "level": level,
+        "answers": [
+            {"answer": correct, "correct": True},
+            {"answer": "5", "correct": False},
+        ],
+    }
+
+
+@pytest.fixture
+def seed(tmp_path, monkeypatch):
+    database = tmp_path / "seed.sqlite"
+    Base.metadata.create_all(create_engine(f"sqlite:///{database}"))
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{database}")
+
+    spec = importlib.util.spec_from_file_location(
+        "seed", os.path.join(BACKEND_DIR, "seeds", "seed.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.engine.echo = False
+    for name in ("initial", "updates"):
+        (tmp_path / name).mkdir()
+    monkeypatch.setattr(module, "INITIAL_SEEDS", str(tmp_path / "initial"))
+    monkeypatch.setattr(module, "UPDATE_SEEDS", str(tmp_path / "updates"))
+    yield module
+    asyncio.run(module.engine.dispose())
+
+
+def run(seed, *argv: str) -> None:
+    args: argparse.Namespace = seed.build_arg_parser().parse_args([*argv, "--workers", "1"])
+    assert asyncio.run(seed.run_seeding(args))
+
+
+def stored(seed) -> tuple:
+    async def load():
+        async with seed.AsyncSessionLocal() as session:
+            level = await session.scalar(select(Question.level))
+            answer = await session.scalar(select(Answer.answer).where(Answer.correct))
+            return level, answer
+
+    return asyncio.run(load())
+
+
+def test_updates_apply_files_recorded_by_a_skip_existing_run(seed, tmp_path):
+    (tmp_path / "initial" / "initial.json").write_text(json.dumps([question(10, "3")]))
+    run(seed, "--all")
+
+    # A fix to an existing question, first picked up by --all, which only
+    # adds new questions, as on a container restart
+    (tmp_path / "updates" / "fix.json").write_text(json.dumps([question(11, "4")]))
+    run(seed, "--all")
+    assert stored(seed) == (10, "3")
+
+    run(seed, "--updates")
+    assert stored(seed) == (11, "4")
+
+
+@pytest.mark.parametrize("text", ["[1 2]", "[1,,2]", "[,1]", "[1,]", "[1]]", "[] x", "[1"])
+def test_json_array_parser_rejects_what_json_load_rejects(seed, text):
+    for read_size in (1, 64):
+        with pytest.raises(ValueError):
+            list(seed.iter_json_array(io.StringIO(text), read_size))
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] \n", '[1, {"a": [2, 3]} ,"x,]"]'])
+def test_json_array_parser_matches_json_load(seed, text):
+    for read_size in (1, 64):
+        assert list(seed.iter_json_array(io.StringIO(text), read_size)) == json.loads(text)